@@ -9,10 +9,12 @@ Package naming must match what __init__.py expects:
 
 Example: spectrena-template-claude-sh-v0.1.0.zip
 """
+import os
 import sys
 import re
-import shutil
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Claude-only for now - other agents may be added later
@@ -26,71 +28,119 @@ COMMAND_DIRS = {
 
 SCRIPT_TYPES = ["sh", "ps"]
 
+# Archives are extracted by the CLI with the stdlib zipfile module, which only
+# reads Zstandard members on Python 3.14+. Stay on DEFLATE (readable everywhere
+# requires-python allows) but use the strongest level - packages are small
+# markdown files, so the extra CPU at release time is negligible.
+COMPRESSION = zipfile.ZIP_DEFLATED
+COMPRESSLEVEL = 9
+
+# Members smaller than this are stored: below ~64 bytes of text, DEFLATE
+# output is no smaller than the input
+STORE_THRESHOLD = 64
+
+# memory/, scripts/ and templates/ references, rewritten in a single pass
+PATH_RE = re.compile(r"/?(memory|scripts|templates)/")
+
 
 def rewrite_paths(content: str) -> str:
     """Rewrite template paths to .spectrena/ paths."""
-    content = re.sub(r"/?memory/", ".spectrena/memory/", content)
-    content = re.sub(r"/?scripts/", ".spectrena/scripts/", content)
-    content = re.sub(r"/?templates/", ".spectrena/templates/", content)
-    return content
+    return PATH_RE.sub(r".spectrena/\1/", content)
+
+
+def add_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes) -> None:
+    """Write data under info, choosing compression by member size."""
+    info.compress_type = zipfile.ZIP_STORED if len(data) < STORE_THRESHOLD else COMPRESSION
+    zf.writestr(info, data, compresslevel=COMPRESSLEVEL)
+
+
+def add_file(zf: zipfile.ZipFile, path: Path, arcname: str) -> None:
+    """Add a file from disk, keeping its timestamp and permissions."""
+    add_member(zf, zipfile.ZipInfo.from_file(path, arcname), path.read_bytes())
+
+
+def add_text(zf: zipfile.ZipFile, arcname: str, content: str) -> None:
+    """Add generated text content as a regular, readable file."""
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+    info.external_attr = 0o644 << 16
+    add_member(zf, info, content.encode())
+
+
+def iter_files(root: Path, skip_dirs: frozenset[str] = frozenset(), prefix: str = ""):
+    """Yield (path, posix relative path) for every file under root.
+
+    Uses os.scandir so file/dir checks come from the directory entry
+    rather than an extra stat, and never descends into skip_dirs.
+    """
+    with os.scandir(root) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    yield from iter_files(Path(entry.path), skip_dirs, f"{prefix}{entry.name}/")
+            elif entry.is_file():
+                yield Path(entry.path), f"{prefix}{entry.name}"
 
 
-def create_agent_package(agent: str, script_type: str, version: str, output_dir: Path):
-    """Create a release package for a specific agent and script type."""
+def render_commands(commands_src: Path = Path("templates/commands")) -> dict[str, str]:
+    """Render command templates once: {stem: rewritten content}.
+
+    The output does not depend on agent or script type, so it is shared by
+    every package.
+    """
+    if not commands_src.exists():
+        return {}
+
+    commands = {}
+    for cmd_file in commands_src.glob("*.md"):
+        content = rewrite_paths(cmd_file.read_text())
+        commands[cmd_file.stem] = content.replace("{ARGS}", "$ARGUMENTS")
+    return commands
+
+
+def create_agent_package(
+    agent: str,
+    script_type: str,
+    version: str,
+    output_dir: Path,
+    commands: dict[str, str] | None = None,
+):
+    """Create a release package for a specific agent and script type.
+
+    Files are streamed straight into the zip under their in-archive paths;
+    nothing is staged on disk. ``commands`` is the output of
+    render_commands(); it is rendered here when not supplied.
+    """
+    if commands is None:
+        commands = render_commands()
+
     # Package name must match pattern in __init__.py download_template_from_github()
     package_name = f"spectrena-template-{agent}-{script_type}-{version}"
-    package_dir = output_dir / package_name
-    package_dir.mkdir(parents=True, exist_ok=True)
-
-    # 1. Copy .spectrena/ structure
-    spectrena_dir = package_dir / ".spectrena"
-    spectrena_dir.mkdir(parents=True, exist_ok=True)
-
-    # Copy memory/
-    memory_src = Path("memory")
-    if memory_src.exists():
-        shutil.copytree(memory_src, spectrena_dir / "memory")
-
-    # NOTE: scripts/ no longer copied - slash commands now work directly
-    # without bash script dependencies (see SPECTRENA-PATCH-005)
-
-    # Copy templates/ (excluding commands/)
-    templates_src = Path("templates")
-    if templates_src.exists():
-        templates_dest = spectrena_dir / "templates"
-        templates_dest.mkdir(parents=True, exist_ok=True)
-
-        for item in templates_src.rglob("*"):
-            if item.is_file() and "commands" not in item.parts:
-                rel_path = item.relative_to(templates_src)
-                dest_file = templates_dest / rel_path
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, dest_file)
-
-    # 2. Generate agent commands
-    commands_src = Path("templates/commands")
-    if commands_src.exists():
-        commands_dest = package_dir / COMMAND_DIRS.get(agent, f".{agent}/commands")
-        commands_dest.mkdir(parents=True, exist_ok=True)
-
-        for cmd_file in commands_src.glob("*.md"):
-            content = cmd_file.read_text()
-            content = rewrite_paths(content)
-            content = content.replace("{ARGS}", "$ARGUMENTS")
-
-            output_file = commands_dest / f"spectrena.{cmd_file.stem}.md"
-            output_file.write_text(content)
-
-    # 3. Create zip
     zip_path = output_dir / f"{package_name}.zip"
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        for file in package_dir.rglob("*"):
-            if file.is_file():
-                arcname = file.relative_to(package_dir)
-                zf.write(file, arcname)
 
-    # Cleanup directory
-    shutil.rmtree(package_dir)
+    with zipfile.ZipFile(
+        zip_path, "w", compression=COMPRESSION, compresslevel=COMPRESSLEVEL
+    ) as zf:
+        # 1. .spectrena/ structure
+
+        # memory/
+        memory_src = Path("memory")
+        if memory_src.exists():
+            for item, rel_path in iter_files(memory_src):
+                add_file(zf, item, f".spectrena/memory/{rel_path}")
+
+        # NOTE: scripts/ no longer copied - slash commands now work directly
+        # without bash script dependencies (see SPECTRENA-PATCH-005)
+
+        # templates/ (excluding commands/)
+        templates_src = Path("templates")
+        if templates_src.exists():
+            for item, rel_path in iter_files(templates_src, frozenset({"commands"})):
+                add_file(zf, item, f".spectrena/templates/{rel_path}")
+
+        # 2. Agent commands (pre-rendered)
+        commands_dest = COMMAND_DIRS.get(agent, f".{agent}/commands")
+        for stem, content in commands.items():
+            add_text(zf, f"{commands_dest}/spectrena.{stem}.md", content)
 
     print(f"Created: {zip_path.name}")
     return zip_path
@@ -107,13 +157,22 @@ def main():
 
     print(f"Creating release packages for {version}...")
 
-    count = 0
-    for agent in AGENTS:
-        for script_type in SCRIPT_TYPES:
-            create_agent_package(agent, script_type, version, output_dir)
-            count += 1
-
-    print(f"\nCreated {count} packages in {output_dir}/")
+    commands = render_commands()
+
+    # Each package writes its own zip, so the builds are independent.
+    # Zip I/O and zlib release the GIL, so threads are enough here.
+    combos = [(agent, script_type) for agent in AGENTS for script_type in SCRIPT_TYPES]
+    with ThreadPoolExecutor(max_workers=min(8, len(combos))) as pool:
+        futures = [
+            pool.submit(
+                create_agent_package, agent, script_type, version, output_dir, commands
+            )
+            for agent, script_type in combos
+        ]
+        for future in futures:
+            future.result()  # Surface any packaging error
+
+    print(f"\nCreated {len(futures)} packages in {output_dir}/")
 
 
 if __name__ == "__main__":
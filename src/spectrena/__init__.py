@@ -24,7 +24,10 @@ Or install globally:
     spectrena init --here
 """
 
+from __future__ import annotations
+
 import os
+import re
 import subprocess
 import sys
 import zipfile
@@ -33,10 +36,10 @@ import shutil
 import shlex
 import json
 from pathlib import Path
-from typing import Any, Callable, TypedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, TypedDict
 
 import typer
-import httpx
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -49,12 +52,26 @@ from typer.core import TyperGroup
 
 # For cross-platform keyboard input
 import readchar
-import ssl
-import truststore
 from datetime import datetime, timezone
 
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-cl = httpx.Client(verify=ssl_context)
+if TYPE_CHECKING:
+    import httpx
+    import ssl
+
+
+# httpx and truststore are only needed for template downloads, so they're
+# imported on first use rather than on every CLI start
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    """System trust store SSL context for GitHub downloads."""
+    import ssl
+    import truststore
+
+    return truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+
+
+# Template folders rewritten under .spectrena/ in generated agent commands
+_COMMAND_PATH_RE = re.compile(r"/?(memory|scripts|templates)/")
 
 
 class AgentConfig(TypedDict):
@@ -915,12 +932,8 @@ def copy_local_templates(
                 # Basic path rewriting - match bash script behavior
                 # The bash script uses: sed -E -e 's@(/?)memory/@.spectrena/memory/@g'
                 # This means: optional leading slash + memory/ → .spectrena/memory/
-                # We use regex to avoid cascading replacements
-                import re
-
-                content = re.sub(r"/?memory/", ".spectrena/memory/", content)
-                content = re.sub(r"/?scripts/", ".spectrena/scripts/", content)
-                content = re.sub(r"/?templates/", ".spectrena/templates/", content)
+                # One regex pass rewrites all three folders without cascading
+                content = _COMMAND_PATH_RE.sub(r".spectrena/\1/", content)
 
                 # For markdown-based agents, use $ARGUMENTS
                 # For TOML-based (gemini, qwen), would need different handling
@@ -1012,7 +1025,9 @@ def download_template_from_github(
     repo_owner = "rghsoftware"
     repo_name = "spectrena"
     if client is None:
-        client = httpx.Client(verify=ssl_context)
+        import httpx
+
+        client = httpx.Client(verify=_ssl_context())
 
     if verbose:
         console.print("[cyan]Fetching latest release information...[/cyan]")
@@ -1694,7 +1709,9 @@ def init(
         tracker.attach_refresh(lambda: live.update(tracker.render()))
         try:
             verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
+            local_ssl_context = _ssl_context() if verify else False
+            import httpx
+
             local_client = httpx.Client(verify=local_ssl_context)
 
             download_and_extract_template(
@@ -2232,6 +2249,7 @@ async def _db_reset(db_path: Path, force: bool):
 
         # Recreate with migrations
         db = LineageDB(db_path)
+        db.reset_schema_check()
         async with db.connect(run_migrations=True) as _:
             pass
 
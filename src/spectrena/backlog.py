@@ -6,24 +6,49 @@ Created: 2025-12-06
 Author: Robert Hamilton
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar
 import re
 
+_T = TypeVar("_T")
 
-@dataclass
+# Spec-id in a "### spec-id" heading
+_SPEC_ID_RE = re.compile(r"[a-z0-9-]+")
+# Every field of an entry body, matched in a single left-to-right scan.
+# Whitespace is [ \t] so an empty field can't capture the next line, and a
+# cell's closing '|' is only looked at, leaving it to open the next cell.
+_FIELD_RE = re.compile(
+    r"\|[ \t]*\*\*(?P<tkey>Weight|Status|Depends On|References)\*\*[ \t]*\|(?P<tval>[^|\n]*)(?=\|)"
+    r"|\*\*Scope:\*\*[ \t]*(?P<sval>.+)"
+    r"|\*\*(?P<bkey>Covers|Does NOT cover):\*\*"
+)
+_DEPENDS_SPLIT_RE = re.compile(r"[,\s]+")
+# Status emoji inside a "| **Status** | ⬜ |" table row
+_STATUS_CELL_RE = re.compile(r"\|\s*\*\*Status\*\*\s*\|\s*([⬜🟨🟩🚫])\s*\|", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
 class BacklogEntry:
-    """Parsed backlog entry."""
+    """Parsed backlog entry (immutable)."""
 
-    spec_id: str
+    spec_id: str  # lowercase
     scope: str
     weight: str  # LIGHTWEIGHT, STANDARD, FORMAL
     status: str  # ⬜, 🟨, 🟩, 🚫
-    depends_on: list[str]
+    depends_on: list[str]  # lowercase
     references: list[str]
     covers: list[str]
     does_not_cover: list[str]
-    raw_content: str
+    # Body location within the parsed file; sliced out only when accessed
+    _content: str = field(default="", repr=False, compare=False)
+    _start: int = field(default=0, repr=False, compare=False)
+    _end: int = field(default=0, repr=False, compare=False)
+
+    @property
+    def raw_content(self) -> str:
+        """Entry body text."""
+        return self._content[self._start : self._end]
 
 
 def parse_backlog(path: Path) -> dict[str, BacklogEntry]:
@@ -34,36 +59,86 @@ def parse_backlog(path: Path) -> dict[str, BacklogEntry]:
     content = path.read_text()
     entries = {}
 
-    # Split by ### headings (spec entries)
-    pattern = r"^### ([a-z0-9-]+)\s*\n(.*?)(?=^### |\Z)"
-    matches = re.findall(pattern, content, re.MULTILINE | re.DOTALL)
-
-    for spec_id, body in matches:
-        entry = _parse_entry(spec_id, body)
-        entries[spec_id.lower()] = entry
+    for spec_id, start, end in _split_sections(content):
+        entry = _parse_entry(spec_id, content, start, end)
+        entries[entry.spec_id] = entry
 
     return entries
 
 
-def _parse_entry(spec_id: str, body: str) -> BacklogEntry:
-    """Parse a single backlog entry."""
-
-    # Extract scope line
-    scope_match = re.search(r"\*\*Scope:\*\*\s*(.+)", body)
-    scope = scope_match.group(1).strip() if scope_match else ""
+def _next_heading(content: str, pos: int) -> int:
+    """Offset of the first ``### `` line starting at or after pos (len if none)."""
+    if pos == 0 and content.startswith("### "):
+        return 0
+    found = content.find("\n### ", max(pos - 1, 0))
+    return len(content) if found == -1 else found + 1
+
+
+def _split_sections(content: str) -> list[tuple[str, int, int]]:
+    """Locate ``### spec-id`` sections as (spec_id, body_start, body_end) offsets.
+
+    A body runs up to the next ``### `` line (any heading) or end of file.
+    Headings that are not a bare spec-id are skipped along with their body.
+    """
+    sections = []
+    end = len(content)
+    head = _next_heading(content, 0)
+
+    while head < end:
+        line_end = content.find("\n", head)
+        if line_end == -1:
+            break
+        next_head = _next_heading(content, line_end + 1)
+
+        spec_id = content[head + 4 : line_end].rstrip()
+        if _SPEC_ID_RE.fullmatch(spec_id):
+            # Drop blank lines between the heading and the body
+            ws_end = line_end
+            while ws_end < next_head and content[ws_end].isspace():
+                ws_end += 1
+            body_start = content.rfind("\n", line_end, ws_end) + 1
+            sections.append((spec_id, body_start, next_head))
+
+        head = next_head
+
+    return sections
+
+
+def _parse_entry(spec_id: str, content: str, start: int, end: int) -> BacklogEntry:
+    """Parse the backlog entry whose body is content[start:end].
+
+    Spec-ids and dependency ids are lowercased here, once, so lookups
+    never need to normalize again.
+    """
+
+    # Collect scope, table attributes and bullet lists in one pass.
+    # The first occurrence of each field wins.
+    fields: dict[str, str] = {}
+    bullets: dict[str, list[str]] = {}
+    for match in _FIELD_RE.finditer(content, start, end):
+        if match.group("tkey"):
+            fields.setdefault(match.group("tkey"), match.group("tval").strip())
+        elif match.group("bkey"):
+            if match.group("bkey") not in bullets:
+                items = _scan_bullets(content, match.end(), end)
+                if items:
+                    bullets[match.group("bkey")] = items
+        else:
+            fields.setdefault("Scope", match.group("sval").strip())
 
-    # Extract table attributes
-    weight = _extract_table_value(body, "Weight") or "STANDARD"
-    status = _extract_table_value(body, "Status") or "⬜"
-    depends_on_raw = _extract_table_value(body, "Depends On") or "(none)"
-    references_raw = _extract_table_value(body, "References") or ""
+    scope = fields.get("Scope", "")
+    weight = fields.get("Weight") or "STANDARD"
+    status = fields.get("Status") or "⬜"
+    depends_on_raw = fields.get("Depends On") or "(none)"
+    references_raw = fields.get("References") or ""
 
     # Parse depends_on
-    if depends_on_raw.lower() in ("(none)", "none", "-", ""):
+    depends_on_raw = depends_on_raw.lower()
+    if depends_on_raw in ("(none)", "none", "-", ""):
         depends_on = []
     else:
         depends_on = [
-            d.strip() for d in re.split(r"[,\s]+", depends_on_raw) if d.strip()
+            d.strip() for d in _DEPENDS_SPLIT_RE.split(depends_on_raw) if d.strip()
         ]
 
     # Parse references (split by comma only, preserve spaces for §Section syntax)
@@ -72,74 +147,141 @@ def _parse_entry(spec_id: str, body: str) -> BacklogEntry:
     else:
         references = []
 
-    # Extract covers list
-    covers = _extract_bullet_list(body, "Covers")
-
-    # Extract does not cover list
-    does_not_cover = _extract_bullet_list(body, "Does NOT cover")
-
     return BacklogEntry(
-        spec_id=spec_id,
+        spec_id=spec_id.lower(),
         scope=scope,
         weight=weight,
         status=status,
         depends_on=depends_on,
         references=references,
-        covers=covers,
-        does_not_cover=does_not_cover,
-        raw_content=body,
+        covers=bullets.get("Covers", []),
+        does_not_cover=bullets.get("Does NOT cover", []),
+        _content=content,
+        _start=start,
+        _end=end,
     )
 
 
-def _extract_table_value(body: str, key: str) -> str | None:
-    """Extract value from markdown table row."""
-    pattern = rf"\|\s*\*\*{key}\*\*\s*\|\s*(.+?)\s*\|"
-    match = re.search(pattern, body)
-    return match.group(1).strip() if match else None
+def _scan_bullets(body: str, pos: int, end: int) -> list[str]:
+    """Collect the ``- item`` lines following a bullet-list marker ending at pos.
 
+    Only whitespace may separate the marker from the list, and the list
+    starts on a new line. Scanning stops at the first line that is not
+    an item or at end, so the cost is linear in the list length.
+    """
+    ws_end = pos
+    while ws_end < end and body[ws_end].isspace():
+        ws_end += 1
 
-def _extract_bullet_list(body: str, heading: str) -> list[str]:
-    """Extract bullet list after a **Heading:** marker."""
-    pattern = rf"\*\*{heading}:\*\*\s*\n((?:- .+\n?)+)"
-    match = re.search(pattern, body)
-    if not match:
+    line_start = body.rfind("\n", pos, ws_end) + 1
+    if not line_start:
         return []
 
-    bullets = match.group(1)
-    return [line[2:].strip() for line in bullets.strip().split("\n") if line.startswith("- ")]
+    items = []
+    while line_start < end:
+        line_end = body.find("\n", line_start, end)
+        if line_end == -1:
+            line_end = end
+        line = body[line_start:line_end]
+        if len(line) < 3 or not line.startswith("- "):
+            break
+        items.append(line[2:].strip())
+        line_start = line_end + 1
+
+    return items
 
 
 def update_backlog_status(path: Path, spec_id: str, new_status: str) -> None:
     """Update a spec's status in the backlog file."""
-    content = path.read_text()
+    update_backlog_statuses(path, {spec_id: new_status})
 
-    # Find the spec section and update its status
-    pattern = rf"(### {re.escape(spec_id)}.*?\|\s*\*\*Status\*\*\s*\|\s*)([⬜🟨🟩🚫])(\s*\|)"
 
-    replacement = rf"\g<1>{new_status}\g<3>"
-    new_content = re.sub(pattern, replacement, content, flags=re.IGNORECASE | re.DOTALL)
+def update_backlog_statuses(path: Path, updates: dict[str, str]) -> None:
+    """Update several specs' statuses with one read and at most one write.
 
-    if new_content != content:
-        path.write_text(new_content)
+    Spec-ids resolve like dependencies (case-insensitive, exact id or
+    ``-``-delimited prefix). Only the status cell inside each matched
+    section is touched; the file is left alone when nothing changes.
+    """
+    if not updates:
+        return
+
+    content = path.read_text()
+    sections = {spec_id: (start, end) for spec_id, start, end in _split_sections(content)}
+    index = _build_prefix_index(sections)
+
+    edits = []
+    for spec_id, new_status in updates.items():
+        bounds = index.get(spec_id.lower())
+        if not bounds:
+            continue
+        match = _STATUS_CELL_RE.search(content, *bounds)
+        if match and match.group(1) != new_status:
+            edits.append((match.start(1), match.end(1), new_status))
+
+    if not edits:
+        return
+
+    # Splice edits in file order
+    edits.sort()
+    pieces = []
+    last = 0
+    for start, end, new_status in edits:
+        pieces.append(content[last:start])
+        pieces.append(new_status)
+        last = end
+    pieces.append(content[last:])
+
+    path.write_text("".join(pieces))
+
+
+def _build_prefix_index(entries: dict[str, _T]) -> dict[str, _T]:
+    """Map every ``-``-delimited prefix of each spec-id to its entry.
+
+    e.g. "core-001-project-setup" is reachable as "core", "core-001",
+    "core-001-project" and the full id. When several specs share a prefix
+    the first one in backlog order wins.
+    """
+    index: dict[str, _T] = {}
+    for full_id, entry in entries.items():
+        end = full_id.find("-")
+        while end != -1:
+            index.setdefault(full_id[:end], entry)
+            end = full_id.find("-", end + 1)
+    # Full ids always resolve to themselves, ahead of any shared prefix
+    index.update(entries)
+    return index
 
 
 def get_dependency_status(
-    entries: dict[str, BacklogEntry], spec_id: str
+    entries: dict[str, BacklogEntry],
+    spec_id: str,
+    prefix_index: dict[str, BacklogEntry] | None = None,
 ) -> dict[str, str]:
-    """Get status of all dependencies for a spec."""
+    """Get status of all dependencies for a spec.
+
+    Dependencies may be given by full id or by prefix (e.g., "core-001"
+    matches "core-001-project-setup"). When several specs match a prefix,
+    the first one in backlog order wins. Result keys are the dependency ids
+    lowercased, as parse_backlog stores them. Pass ``prefix_index`` from
+    _build_prefix_index() when resolving many specs against the same entries.
+    """
     entry = entries.get(spec_id.lower())
     if not entry:
         return {}
 
+    if prefix_index is None:
+        prefix_index = _build_prefix_index(entries)
+
     result = {}
     for dep_id in entry.depends_on:
-        # Try exact match first
-        dep_entry = entries.get(dep_id.lower())
+        dep_entry = prefix_index.get(dep_id)
 
-        # If not found, try to find by prefix (e.g., "core-001" matches "core-001-project-setup")
+        # The index only holds prefixes ending on a '-' boundary; fall back
+        # to a scan for any other prefix (e.g. "core-00")
         if not dep_entry:
             for full_id, candidate in entries.items():
-                if full_id.startswith(dep_id.lower()):
+                if full_id.startswith(dep_id):
                     dep_entry = candidate
                     break
 
@@ -8,12 +8,42 @@ Author: Robert Hamilton
 
 
 from pathlib import Path
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Callable, Iterator, Optional
+import os
 import re
+import shutil
+import sys
 
 
-@dataclass
+_DASH_RUN_RE = re.compile(r"-+")
+_PLACEHOLDER_RE = re.compile(r"\{(NNN|slug|project|component)\}(-?)")
+_OPTIONAL_PLACEHOLDERS = frozenset({"project", "component"})
+
+
+def _branch_pattern(template: str, project: Optional[str], padding: int) -> str:
+    pattern = "^"
+    if "{project}" in template:
+        pattern += f"{re.escape(project)}-" if project else r"[A-Z][A-Z0-9_]*-"
+    if "{component}" in template:
+        pattern += r"[A-Z][A-Z0-9_]*-"
+    pattern += r"[0-9]{" + str(padding) + r"}-"
+    return pattern
+
+
+@lru_cache(maxsize=32)
+def _branch_pattern_re(
+    template: str, project: Optional[str], padding: int
+) -> re.Pattern[str]:
+    # Keyed on the fields rather than cached on the instance, since
+    # SpecIdConfig is mutated after construction (load, wizard).
+    return re.compile(_branch_pattern(template, project, padding))
+
+
+@dataclass(slots=True)
 class SpecIdConfig:
     template: str = "{NNN}-{slug}"
     padding: int = 3
@@ -30,42 +60,43 @@ class SpecIdConfig:
         return "{project}" in self.template
 
     def build_branch_pattern(self) -> str:
-        pattern = "^"
-        if self.requires_project:
-            pattern += (
-                f"{re.escape(self.project)}-" if self.project else r"[A-Z][A-Z0-9_]*-"
-            )
-        if self.requires_component:
-            pattern += r"[A-Z][A-Z0-9_]*-"
-        pattern += r"[0-9]{" + str(self.padding) + r"}-"
-        return pattern
+        return _branch_pattern(self.template, self.project, self.padding)
+
+    @property
+    def branch_pattern_re(self) -> re.Pattern[str]:
+        """Compiled build_branch_pattern(), cached per template/project/padding."""
+        return _branch_pattern_re(self.template, self.project, self.padding)
 
     def generate_spec_id(
         self, number: int, slug: str, component: Optional[str] = None
     ) -> str:
-        padded = str(number).zfill(self.padding)
-        result = self.template
-        result = result.replace("{NNN}", padded).replace("{slug}", slug)
-
-        if self.project:
-            result = result.replace("{project}", self.project)
-        else:
-            result = result.replace("{project}-", "").replace("{project}", "")
+        values = {
+            "NNN": str(number).zfill(self.padding),
+            "slug": slug,
+            "project": self.project or "",
+            "component": component or "",
+        }
 
-        if component:
-            result = result.replace("{component}", component)
-        else:
-            result = result.replace("{component}-", "").replace("{component}", "")
+        def substitute(match: re.Match) -> str:
+            name, dash = match.groups()
+            value = values[name]
+            if not value and name in _OPTIONAL_PLACEHOLDERS:
+                return ""  # Drop an unset {project}/{component} with its dash
+            return value + dash
 
-        return re.sub(r"-+", "-", result).strip("-")
+        result = _PLACEHOLDER_RE.sub(substitute, self.template)
+        if "--" in result:  # Only collapse when a substitution left a run
+            result = _DASH_RUN_RE.sub("-", result)
+        return result.strip("-")
 
     def validate_component(self, component: str) -> bool:
         if not self.components:
             return True
-        return component.upper() in [c.upper() for c in self.components]
+        component = component.upper()
+        return any(c.upper() == component for c in self.components)
 
 
-@dataclass
+@dataclass(slots=True)
 class LineageConfig:
     """Lineage tracking configuration."""
 
@@ -74,7 +105,7 @@ class LineageConfig:
     auto_register: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class BacklogConfig:
     """Spec backlog configuration."""
 
@@ -83,14 +114,14 @@ class BacklogConfig:
     reference_docs: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowConfig:
     require_component_flag: bool = True
     validate_components: bool = True
     max_clarifications: int = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class GitConfig:
     """Git provider configuration."""
 
@@ -107,7 +138,7 @@ class GitConfig:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Project configuration."""
 
@@ -122,75 +153,103 @@ class Config:
         if project_dir is None:
             project_dir = Path.cwd()
         config_path = project_dir / ".spectrena" / "config.yml"
-        if not config_path.exists():
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            return cls()
+        if stat.st_size == 0:
             return cls()
-        return cls._parse_yaml(config_path)
+
+        # Reuse the parsed sections while the file is unchanged; a fresh
+        # Config is still built each time so callers may mutate it freely.
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _SECTIONS_CACHE.get(str(config_path))
+        if cached is not None and cached[0] == version:
+            sections = cached[1]
+        else:
+            sections = _parse_yaml_sections(config_path.read_bytes().decode("utf-8"))
+            # One entry per path, so edits replace rather than accumulate
+            _SECTIONS_CACHE[str(config_path)] = (version, sections)
+        return cls._from_sections(sections)
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Forget previously parsed config files."""
+        _SECTIONS_CACHE.clear()
 
     @classmethod
-    def _parse_yaml(cls, path: Path) -> "Config":
-        content = path.read_text()
+    def _from_sections(cls, sections: dict[str, "YamlSection"]) -> "Config":
         config = cls()
 
+        spec_id = sections.get("spec_id", {})
         config.spec_id.template = (
-            _yaml_get(content, "spec_id", "template") or config.spec_id.template
+            _yaml_str(spec_id, "template") or config.spec_id.template
         )
-        padding = _yaml_get(content, "spec_id", "padding")
+        padding = _yaml_str(spec_id, "padding")
         if padding:
             config.spec_id.padding = int(padding)
-        config.spec_id.project = _yaml_get(content, "spec_id", "project")
+        config.spec_id.project = _yaml_str(spec_id, "project")
         config.spec_id.numbering_source = (
-            _yaml_get(content, "spec_id", "numbering_source")
+            _yaml_str(spec_id, "numbering_source")
             or config.spec_id.numbering_source
         )
-        config.spec_id.components = (
-            _yaml_get_array(content, "spec_id", "components") or []
-        )
+        config.spec_id.components = _yaml_list(spec_id, "components")
 
-        # Parse lineage section
-        enabled = _yaml_get(content, "lineage", "enabled")
+        # Parse lineage section; sub-keys are only read when enabled
+        lineage = sections.get("lineage", {})
+        enabled = _yaml_str(lineage, "enabled")
         if enabled:
-            config.lineage.enabled = enabled.lower() == "true"
+            config.lineage.enabled = enabled in _TRUE_VALUES
         if config.lineage.enabled:
-            db_url = _yaml_get(content, "lineage", "lineage_db")
+            db_url = _yaml_str(lineage, "lineage_db")
             if db_url:
                 config.lineage.lineage_db = db_url
-            auto_reg = _yaml_get(content, "lineage", "auto_register")
+            auto_reg = _yaml_str(lineage, "auto_register")
             if auto_reg:
-                config.lineage.auto_register = auto_reg.lower() == "true"
+                config.lineage.auto_register = auto_reg in _TRUE_VALUES
 
         # Parse backlog section
-        backlog_enabled = _yaml_get(content, "backlog", "enabled")
+        backlog = sections.get("backlog", {})
+        backlog_enabled = _yaml_str(backlog, "enabled")
         if backlog_enabled:
-            config.backlog.enabled = backlog_enabled.lower() == "true"
+            config.backlog.enabled = backlog_enabled in _TRUE_VALUES
         if config.backlog.enabled:
-            backlog_path = _yaml_get(content, "backlog", "path")
+            backlog_path = _yaml_str(backlog, "path")
             if backlog_path:
                 config.backlog.path = backlog_path
             # Parse reference_docs dictionary
-            config.backlog.reference_docs = _yaml_get_dict(content, "backlog", "reference_docs")
-
-        # Parse git section
-        git_provider = _yaml_get(content, "git", "provider")
-        if git_provider:
-            config.git.provider = git_provider
-        git_default_branch = _yaml_get(content, "git", "default_branch")
-        if git_default_branch:
-            config.git.default_branch = git_default_branch
-        git_auto_delete = _yaml_get(content, "git", "auto_delete_branch")
-        if git_auto_delete:
-            config.git.auto_delete_branch = git_auto_delete.lower() == "true"
-        git_pr_template = _yaml_get(content, "git", "pr_template")
-        if git_pr_template:
-            config.git.pr_template = git_pr_template
+            config.backlog.reference_docs = _yaml_dict(backlog, "reference_docs")
+
+        # Parse git section (skipped entirely when absent)
+        git = sections.get("git")
+        if git:
+            git_provider = _yaml_str(git, "provider")
+            if git_provider:
+                config.git.provider = git_provider
+            git_default_branch = _yaml_str(git, "default_branch")
+            if git_default_branch:
+                config.git.default_branch = git_default_branch
+            git_auto_delete = _yaml_str(git, "auto_delete_branch")
+            if git_auto_delete:
+                config.git.auto_delete_branch = git_auto_delete in _TRUE_VALUES
+            git_pr_template = _yaml_str(git, "pr_template")
+            if git_pr_template:
+                config.git.pr_template = git_pr_template
 
         return config
 
     def save(self, project_dir: Optional[Path] = None):
         if project_dir is None:
             project_dir = Path.cwd()
-        config_dir = project_dir / ".spectrena"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        (config_dir / "config.yml").write_text(self._generate_yaml())
+        config_path = project_dir / ".spectrena" / "config.yml"
+        data = self._generate_yaml().encode("utf-8")
+        try:
+            config_path.write_bytes(data)
+        except FileNotFoundError:
+            # First save: create .spectrena/ only when it's missing
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            config_path.write_bytes(data)
+        Config.invalidate_cache()
 
     def _generate_yaml(self) -> str:
         lines = [
@@ -258,84 +317,207 @@ class Config:
         return "\n".join(lines) + "\n"
 
 
-def _yaml_get(content: str, parent: str, child: str) -> Optional[str]:
-    in_section = False
-    for line in content.split("\n"):
-        if re.match(rf"^{parent}:\s*$", line):
-            in_section = True
+# Line shapes understood by _parse_yaml_sections
+_SECTION_RE = re.compile(r"^([A-Za-z_]\w*):\s*$")
+_LOWER_KEY_RE = re.compile(r"[a-z_]+")
+_DICT_KEY_RE = re.compile(r"[A-Z_]+")
+
+YamlSection = dict[str, "str | list[str] | dict[str, str]"]
+
+# Boolean spellings YAML 1.1 reads as true, plus "1" which was always accepted
+_TRUE_VALUES = frozenset({
+    "true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON",
+    "y", "Y", "1",
+})
+
+# Parsed config files: path -> ((st_mtime_ns, st_size), sections)
+_SECTIONS_CACHE: dict[str, tuple[tuple[int, int], dict[str, YamlSection]]] = {}
+
+
+def _yaml_unquote(value: str) -> str:
+    return value.strip().strip('"').strip("'")
+
+
+def _parse_yaml_sections(content: str) -> dict[str, YamlSection]:
+    """Parse the config subset of YAML in a single pass over the lines.
+
+    Returns {section: {key: value}} where a value is a string, a list
+    (``key:`` followed by ``- item`` lines) or a dict (``key:`` followed
+    by 4-space indented ``UPPER_KEY: value`` lines). A section ends at
+    the next unindented line. The first occurrence of a scalar key wins.
+    """
+    sections: dict[str, YamlSection] = {}
+    section: YamlSection | None = None
+    nested: str | None = None  # Key whose list/dict items are being read
+
+    for line in content.splitlines():
+        if not line:
             continue
-        if in_section and line and not line[0].isspace():
-            in_section = False
-        if in_section:
-            match = re.match(rf"^\s+{child}:\s*(.+)$", line)
-            if match:
-                return match.group(1).strip().strip('"').strip("'")
-    return None
-
-
-def _yaml_get_array(content: str, parent: str, key: str) -> list[str]:
-    result, in_section, in_array = [], False, False
-    for line in content.split("\n"):
-        if re.match(rf"^{parent}:\s*$", line):
-            in_section = True
+        if not line[0].isspace():
+            # Unindented: starts a new section or ends the current one
+            header = _SECTION_RE.match(line)
+            if header:
+                section = sections.setdefault(header.group(1), {})
+            else:
+                section = None
+            nested = None
             continue
-        if in_section and line and not line[0].isspace():
-            in_section = in_array = False
-        if in_section:
-            if re.match(rf"^\s+{key}:\s*$", line):
-                in_array = True
-                continue
-            if in_array and re.match(r"^\s+[a-z_]+:", line):
-                in_array = False
-            if in_array:
-                match = re.match(r"^\s+-\s*(.+)$", line)
-                if match:
-                    result.append(match.group(1).strip().strip('"').strip("'"))
-    return result
-
-
-def _yaml_get_dict(content: str, parent: str, key: str) -> dict[str, str]:
-    """Parse a dictionary from YAML content."""
-    result, in_section, in_dict = {}, False, False
-    for line in content.split("\n"):
-        if re.match(rf"^{parent}:\s*$", line):
-            in_section = True
+        stripped = line.lstrip()
+        if section is None or not stripped:
+            continue
+
+        if stripped[0] == "-" and len(stripped) > 1:
+            if nested is not None:
+                items = section.setdefault(nested, [])
+                if isinstance(items, list):
+                    items.append(_yaml_unquote(stripped[1:]))
+            continue
+
+        key, sep, value = stripped.partition(":")
+        if not sep or not key or key.split(maxsplit=1)[0] != key:
+            continue
+        if not value.strip():
+            # Only lowercase keys (components:, reference_docs:) open a
+            # nested list or dict; an empty UPPER_KEY: inside one is skipped
+            if _LOWER_KEY_RE.fullmatch(key):
+                nested = key
             continue
-        if in_section and line and not line[0].isspace():
-            in_section = in_dict = False
-        if in_section:
-            if re.match(rf"^\s+{key}:\s*$", line):
-                in_dict = True
+        if nested is not None:
+            if len(line) - len(stripped) == 4 and _DICT_KEY_RE.fullmatch(key):
+                entries = section.setdefault(nested, {})
+                if isinstance(entries, dict):
+                    entries[key] = _yaml_unquote(value)
                 continue
-            if in_dict and re.match(r"^\s+[a-z_]+:", line):
-                in_dict = False
-            if in_dict:
-                # Match key: value pairs with proper indentation (4 spaces for nested dict)
-                match = re.match(r"^\s{4}([A-Z_]+):\s*(.+)$", line)
-                if match:
-                    dict_key = match.group(1).strip()
-                    dict_val = match.group(2).strip().strip('"').strip("'")
-                    result[dict_key] = dict_val
-    return result
+            if _LOWER_KEY_RE.fullmatch(key):
+                nested = None
+        section.setdefault(key, _yaml_unquote(value))
+
+    return sections
+
+
+def _yaml_str(section: YamlSection, key: str) -> Optional[str]:
+    value = section.get(key)
+    return value if isinstance(value, str) else None
+
+
+def _yaml_list(section: YamlSection, key: str) -> list[str]:
+    value = section.get(key)
+    return list(value) if isinstance(value, list) else []
+
+
+def _yaml_dict(section: YamlSection, key: str) -> dict[str, str]:
+    value = section.get(key)
+    return dict(value) if isinstance(value, dict) else {}
+
+
+# Menu keys as read from a POSIX terminal in cbreak mode
+_POSIX_MENU_KEYS = {
+    b"\x1b[A": "up",
+    b"\x1bOA": "up",
+    b"\x10": "up",  # Ctrl+P
+    b"\x1b[B": "down",
+    b"\x1bOB": "down",
+    b"\x0e": "down",  # Ctrl+N
+    b"\n": "enter",
+    b"\r": "enter",
+    b"\x1b": "escape",
+}
+
+
+def _split_posix_key(buffer: bytes) -> tuple[bytes, bytes]:
+    """Split the first keystroke off bytes read from the terminal.
+
+    One read can return several keys (a fast double arrow press, pasted
+    text), so each is taken off in turn: a CSI/SS3 escape sequence, a lone
+    escape, or one UTF-8 encoded character.
+    """
+    if buffer[:1] == b"\x1b":
+        if buffer[1:2] == b"O" and len(buffer) > 2:
+            return buffer[:3], buffer[3:]
+        if buffer[1:2] == b"[":
+            # Parameters, then a final byte in @..~
+            for i in range(2, len(buffer)):
+                if 0x40 <= buffer[i] <= 0x7E:
+                    return buffer[: i + 1], buffer[i + 1 :]
+            return buffer, b""
+        return buffer[:1], buffer[1:]
+
+    lead = buffer[0]
+    size = 4 if lead >= 0xF0 else 3 if lead >= 0xE0 else 2 if lead >= 0xC0 else 1
+    return buffer[:size], buffer[size:]
+
+
+@contextmanager
+def _menu_key_reader() -> Iterator[Callable[[], str]]:
+    """Yield a function that reads one menu key.
+
+    Keys come back as "up", "down", "enter" or "escape", or as the raw
+    text otherwise. On POSIX the terminal is put in cbreak mode once for
+    the whole menu and keys are read with os.read, instead of readchar
+    switching modes for every character. Windows falls back to readchar.
+    """
+    if os.name == "nt":
+        import readchar
+
+        keys = {
+            readchar.key.UP: "up",
+            "\x10": "up",
+            readchar.key.DOWN: "down",
+            "\x0e": "down",
+            readchar.key.ENTER: "enter",
+            "\r": "enter",
+            readchar.key.ESC: "escape",
+        }
 
+        def read_key() -> str:
+            key = readchar.readkey()
+            return keys.get(key, key)
+
+        yield read_key
+        return
+
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    tty.setcbreak(fd)  # Ctrl+C still raises KeyboardInterrupt
+
+    pending = b""
+
+    def read_key() -> str:
+        nonlocal pending
+        if not pending:
+            pending = os.read(fd, 64)
+        raw, pending = _split_posix_key(pending)
+        return _POSIX_MENU_KEYS.get(raw) or raw.decode(errors="replace")
 
-def _check_lineage_available() -> bool:
-    """Check if lineage optional dependencies are installed."""
     try:
-        import surrealdb  # noqa: F401
-        import fastmcp  # noqa: F401
+        yield read_key
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
 
-        return True
-    except ImportError:
-        return False
+@lru_cache(maxsize=None)
+def _which(cmd: str) -> Optional[str]:
+    """shutil.which, remembered for the life of the process."""
+    return shutil.which(cmd)
+
+
+def _check_lineage_available() -> bool:
+    """Check if lineage optional dependencies are installed."""
+    # find_spec locates the packages without executing their (heavy) imports
+    return all(find_spec(name) is not None for name in ("surrealdb", "fastmcp"))
 
 
 def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
     """Interactive configuration wizard."""
-    from rich.console import Console
+    from rich.console import Console, Group
+    from rich.live import Live
     from rich.panel import Panel
     from rich.table import Table
-    import readchar
+    from rich.text import Text
+    import typer
 
     console = Console()
     config = Config()
@@ -348,31 +530,46 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
     ]
 
     def select_menu(options, title):
-        selected = 0
-        while True:
-            console.clear()
+        # Build both states of every row once; key presses only swap rows
+        rows = []
+        for name, _, example, description in options:
+            cells = (Text(description), Text(f"→ {example}"))
+            rows.append(
+                (
+                    (Text(" "), Text(name), *cells),
+                    (Text("▶"), Text(name, style="bold cyan"), *cells),
+                )
+            )
+        hint = Text.from_markup("\n[dim]↑/↓ navigate • Enter select[/]")
+
+        def render(selected):
             table = Table.grid(padding=(0, 2))
             table.add_column(width=3)
             table.add_column(width=12)
             table.add_column(style="dim", width=30)
             table.add_column(style="dim")
-            for i, (name, _, example, description) in enumerate(options):
-                prefix = "▶" if i == selected else " "
-                style = "bold cyan" if i == selected else ""
-                formatted_name = f"[{style}]{name}[/]" if style else name
-                table.add_row(prefix, formatted_name, description, f"→ {example}")
-            console.print(Panel(table, title=title, border_style="cyan"))
-            console.print("\n[dim]↑/↓ navigate • Enter select[/]")
+            for i, (plain, highlighted) in enumerate(rows):
+                table.add_row(*(highlighted if i == selected else plain))
+            return Group(Panel(table, title=title, border_style="cyan"), hint)
 
-            key = readchar.readkey()
-            if key in (readchar.key.UP, "\x10"):
-                selected = (selected - 1) % len(options)
-            elif key in (readchar.key.DOWN, "\x0e"):
-                selected = (selected + 1) % len(options)
-            elif key in (readchar.key.ENTER, "\r"):
-                return selected
-            elif key in (readchar.key.ESCAPE, "\x1b"):
-                return -1
+        selected = 0
+        console.clear()
+        with _menu_key_reader() as read_key, Live(
+            render(selected), console=console, transient=True, auto_refresh=False
+        ) as live:
+            while True:
+                key = read_key()
+                if key == "up":
+                    selected = (selected - 1) % len(options)
+                elif key == "down":
+                    selected = (selected + 1) % len(options)
+                elif key == "enter":
+                    return selected
+                elif key == "escape":
+                    return -1
+                else:
+                    continue  # Nothing changed, skip the redraw
+                live.update(render(selected), refresh=True)
 
     # Show intro message before format selection
     console.clear()
@@ -461,8 +658,6 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
     lineage_available = _check_lineage_available()
 
     if lineage_available:
-        import typer
-
         enable_lineage = typer.confirm("Enable lineage tracking?", default=False)
 
         if enable_lineage:
@@ -495,8 +690,6 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
         )
     )
 
-    import typer
-
     enable_backlog = typer.confirm("Enable spec backlog?", default=False)
 
     if enable_backlog:
@@ -527,8 +720,6 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
 
         # Create backlog from template if doesn't exist
         if project_dir:
-            import shutil
-
             backlog_file = project_dir / backlog_path
             if not backlog_file.exists():
                 # Look for template in templates directory
@@ -580,8 +771,6 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
         )
     )
 
-    import shutil
-
     provider_choices = {
         "github": "GitHub (uses gh CLI)",
         "gitlab": "GitLab (uses glab CLI)",
@@ -602,7 +791,7 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
 
     # Check CLI availability
     if provider == "github":
-        if not shutil.which("gh"):
+        if not _which("gh"):
             console.print(
                 "[yellow]⚠ gh CLI not found. Install: https://cli.github.com/[/yellow]"
             )
@@ -610,7 +799,7 @@ def run_config_wizard(project_dir: Optional[Path] = None) -> Config:
                 "[dim]You can still use spectrena, but PR creation will be manual.[/dim]"
             )
     elif provider == "gitlab":
-        if not shutil.which("glab"):
+        if not _which("glab"):
             console.print(
                 "[yellow]⚠ glab CLI not found. Install: https://gitlab.com/gitlab-org/cli[/yellow]"
             )
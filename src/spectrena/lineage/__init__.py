@@ -3,15 +3,23 @@
 
 from pathlib import Path
 
-# Re-export for convenience
-from spectrena.lineage.db import LineageDB, create_mcp_server
-
 __all__ = ["LineageDB", "create_mcp_server", "init_lineage_db"]
 
 
+def __getattr__(name: str):
+    # Re-export for convenience, importing db (and surrealdb/fastmcp) only
+    # when one of these is actually used
+    if name in ("LineageDB", "create_mcp_server"):
+        from spectrena.lineage import db
+
+        return getattr(db, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 async def init_lineage_db():
     """Initialize lineage database with schema."""
     from spectrena.config import Config
+    from spectrena.lineage.db import LineageDB
 
     config = Config.load()
     if not config.lineage.enabled:
@@ -3,51 +3,111 @@
 Spectrena Lineage with SurrealDB
 """
 
-from surrealdb import AsyncSurreal
+from surrealdb import AsyncSurreal, RecordID
 from pathlib import Path
+import asyncio
+import functools
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from typing import cast
 
+from spectrena.lineage.migrations import ensure_schema, SchemaVersionError
 
-def _record_id(table: str, id: str) -> str:
-    """
-    Generate a safe SurrealDB record ID reference for queries.
 
-    Handles IDs with special characters like dots, spaces, etc.
+# Separators folded to '_' when deriving a symbol record id from its FQN
+_SYMBOL_ID_SEP_RE = re.compile(r"::|[./]")
 
-    Args:
-        table: Table name (e.g., 'task', 'spec', 'commit')
-        id: Record ID (e.g., '3.1', 'CORE-001', 'abc-123')
+# Connection strings whose schema is known to be current in this process
+_SCHEMA_CHECKED: set[str] = set()
 
-    Returns:
-        Safe record reference for use in queries.
+# Read cache for the context/progress queries the MCP tools repeat
+_CACHE_SIZE = 128
+_CACHE_TTL = 30.0  # seconds
 
-    Example:
-        _record_id('task', '3.1') -> "type::thing('task', '3.1')"
-    """
-    # Escape single quotes in ID
-    safe_id = id.replace("'", "\\'")
-    return f"type::thing('{table}', '{safe_id}')"
 
+def _cached_read(kind: str):
+    """Serve a LineageDB read method from its LRU cache, keyed on the args.
 
-def _record_literal(table: str, id: str) -> str:
+    Entries expire after _CACHE_TTL seconds and are dropped early by the
+    write methods via LineageDB._invalidate().
     """
-    Generate a record ID literal for CREATE/UPDATE statements.
 
-    Args:
-        table: Table name
-        id: Record ID
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self: "LineageDB", *args):
+            cache = self._read_cache
+            key = (kind, *args)
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                cache.move_to_end(key)
+                self._cache_hits += 1
+                return entry[1]
+
+            self._cache_misses += 1
+            generation = self._cache_generation
+            value = await method(self, *args)
+            # Don't store a result that raced with a write
+            if generation == self._cache_generation:
+                cache[key] = (now + _CACHE_TTL, value)
+                cache.move_to_end(key)
+                while len(cache) > _CACHE_SIZE:
+                    cache.popitem(last=False)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _one(result: object) -> dict[str, object] | None:
+    """First record of a query/create result, which may be a list or a dict."""
+    if type(result) is list:
+        return result[0] if result else None
+    if type(result) is dict:
+        return result
+    return None
 
-    Returns:
-        Record literal like task:`3.1`
+
+def _many(result: object) -> list[object]:
+    """All records of a query result, wrapping a lone record in a list."""
+    if type(result) is list:
+        return result
+    return [result]
+
+
+# Deepest impact tree get_impact_tree() will build
+_IMPACT_MAX_DEPTH = 10
+
+
+@functools.lru_cache(maxsize=_IMPACT_MAX_DEPTH)
+def _impact_tree_sql(depth: int) -> str:
+    """Nested SELECT returning dependents of $spec, `depth` levels deep.
+
+    Each level's subquery matches specs depending on its parent row
+    ($parent), so the server walks the whole tree in one round-trip.
     """
-    # Backtick escape for literals
-    safe_id = id.replace("`", "\\`")
-    return f"{table}:`{safe_id}`"
+    sql = ""
+    for level in range(depth):
+        fields = "id, title, status, component"
+        if sql:
+            fields += f", ({sql}) AS blocked_specs"
+        target = "$spec" if level == depth - 1 else "$parent.id"
+        sql = f"SELECT {fields} FROM spec WHERE ->depends_on->spec CONTAINS {target}"
+    return sql
 
 
 class LineageDB:
-    """SurrealDB-backed lineage tracking."""
+    """SurrealDB-backed lineage tracking.
+
+    Each operation opens its own connection and closes it when done. The
+    embedded surrealkv:// store locks its files while a connection is open,
+    so none is held between operations and other processes (``spectrena db
+    ...``, migrations, updates) can get at the database.
+    """
 
     db_path: Path
     connection_string: str
@@ -61,6 +121,34 @@ class LineageDB:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.connection_string = f"surrealkv://{self.db_path}"
 
+        self._read_cache: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    async def _run_migrations(self, db: AsyncSurreal) -> None:
+        if self.connection_string in _SCHEMA_CHECKED:
+            # Another instance already brought this database up to date
+            self._migrations_run = True
+            return
+        try:
+            await ensure_schema(db, backup=True)
+            self._migrations_run = True
+            _SCHEMA_CHECKED.add(self.connection_string)
+        except SchemaVersionError as e:
+            # Re-raise schema version errors
+            raise
+        except Exception as e:
+            # Log other errors but continue
+            from rich.console import Console
+            console = Console()
+            console.print(f"[yellow]Warning: Migration failed:[/yellow] {e}")
+
+    def reset_schema_check(self) -> None:
+        """Forget that this database's schema is current, e.g. after deleting it."""
+        self._migrations_run = False
+        _SCHEMA_CHECKED.discard(self.connection_string)
+
     @asynccontextmanager
     async def connect(self, run_migrations: bool = True):
         """Async context manager for database connection.
@@ -73,26 +161,51 @@ class LineageDB:
 
             # Run migrations on first connection if requested
             if run_migrations and not self._migrations_run:
-                from spectrena.lineage.migrations import ensure_schema, SchemaVersionError
-                try:
-                    await ensure_schema(db, backup=True)
-                    self._migrations_run = True
-                except SchemaVersionError as e:
-                    # Re-raise schema version errors
-                    raise
-                except Exception as e:
-                    # Log other errors but continue
-                    from rich.console import Console
-                    console = Console()
-                    console.print(f"[yellow]Warning: Migration failed:[/yellow] {e}")
+                await self._run_migrations(db)
 
             yield db
 
+    async def _query(
+        self, sql: str, bindings: dict[str, object] | None = None
+    ) -> object:
+        """Run one query on its own connection, migrating first if needed."""
+        async with self.connect() as db:
+            return await db.query(sql, bindings)
+
+    def _invalidate(self, kind: str, *args: object) -> None:
+        """Drop cached reads of `kind`: the entry for `args`, or all of them."""
+        self._cache_generation += 1
+        if args:
+            self._read_cache.pop((kind, *args), None)
+            return
+        for key in [k for k in self._read_cache if k[0] == kind]:
+            del self._read_cache[key]
+
+    def _invalidate_task(self, task_id: str) -> None:
+        """Drop cached reads that include a task's status."""
+        self._invalidate("task_context", task_id)
+        self._invalidate("current_context")
+        self._invalidate("spec_progress")  # The task's spec isn't known here
+
+    def cache_stats(self) -> dict[str, object]:
+        """Read cache size and hit/miss counts."""
+        return {
+            "entries": len(self._read_cache),
+            "max_entries": _CACHE_SIZE,
+            "ttl_seconds": _CACHE_TTL,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+        }
+
+    def cache_clear(self) -> None:
+        """Drop all cached reads."""
+        self._cache_generation += 1
+        self._read_cache.clear()
+
     async def init_schema(self, schema_path: Path):
         """Initialize database with schema."""
         schema = schema_path.read_text()
-        async with self.connect() as db:
-            _ = await db.query(schema)
+        _ = await self._query(schema)
 
     # -------------------------------------------------------------------------
     # Spec Operations
@@ -107,11 +220,9 @@ class LineageDB:
         weight: str = "STANDARD",
     ) -> dict[str, object]:
         """Register a new specification."""
-        record = _record_literal("spec", spec_id)
-
         async with self.connect() as db:
             result = await db.create(
-                record,
+                RecordID("spec", spec_id),
                 {
                     "id": spec_id,
                     "title": title,
@@ -121,64 +232,107 @@ class LineageDB:
                     "status": "draft",
                 },
             )
+            self._invalidate("spec_progress", spec_id)
             # SurrealDB create returns a dict for single record creation
-            if isinstance(result, dict):
-                return cast(dict[str, object], result)
-            return cast(dict[str, object], result[0])
+            return _one(result) or {}
 
     async def add_dependency(
         self, from_spec: str, to_spec: str, dependency_type: str = "hard"
     ) -> dict[str, object]:
         """Add spec dependency edge."""
-        from_record = _record_literal("spec", from_spec)
-        to_record = _record_literal("spec", to_spec)
+        result = await self._query(
+            """
+            RELATE $from->depends_on->$to
+            SET dependency_type = $type
+        """,
+            {
+                "from": RecordID("spec", from_spec),
+                "to": RecordID("spec", to_spec),
+                "type": dependency_type,
+            },
+        )
+        return _one(result) or {}
+
+    async def set_dependencies(
+        self,
+        edges: list[tuple[str, str, str]],
+        spec_ids: list[str] | None = None,
+    ) -> int:
+        """Replace the dependency edges of a graph in one transaction.
 
-        async with self.connect() as db:
-            result = await db.query(
-                f"""
-                RELATE {from_record}->depends_on->{to_record}
-                SET dependency_type = $type
-            """,
-                {"type": dependency_type},
+        Every spec in ``spec_ids`` and every edge source first loses its
+        outgoing depends_on edges, then each (from_spec, to_spec,
+        dependency_type) edge is related again. Re-saving a graph therefore
+        neither duplicates edges nor keeps ones removed from it.
+
+        Returns the number of edges actually stored.
+        """
+        sources = list(dict.fromkeys([*(spec_ids or ()), *(e[0] for e in edges)]))
+        if not sources:
+            return 0
+
+        statements = [
+            "BEGIN TRANSACTION;",
+            "DELETE depends_on WHERE in IN $sources;",
+        ]
+        bindings: dict[str, object] = {
+            "sources": [RecordID("spec", spec) for spec in sources]
+        }
+        for i, (from_spec, to_spec, dependency_type) in enumerate(edges):
+            statements.append(
+                f"RELATE $from_{i}->depends_on->$to_{i} SET dependency_type = $type_{i};"
             )
-            if isinstance(result, dict):
-                return cast(dict[str, object], result)
-            return cast(dict[str, object], result[0]) if result else {}
+            bindings[f"from_{i}"] = RecordID("spec", from_spec)
+            bindings[f"to_{i}"] = RecordID("spec", to_spec)
+            bindings[f"type_{i}"] = dependency_type
+        statements.append("COMMIT TRANSACTION;")
+
+        # query() only surfaces the first statement's result; the raw
+        # response has a status for each one (the DELETE comes first)
+        async with self.connect() as db:
+            response = await db.query_raw("\n".join(statements), bindings)
+        results = response.get("result") or []
+        return sum(1 for r in results[1:] if r.get("status") == "OK")
 
     async def get_blocked_by(self, spec_id: str) -> list[object]:
         """Get all specs that would be blocked if this spec slips."""
-        record = _record_id("spec", spec_id)
-
-        async with self.connect() as db:
-            result = await db.query(
-                f"""
-                SELECT
-                    id, title, status, component
-                FROM spec
-                WHERE ->depends_on->spec CONTAINS {record}
+        result = await self._query(
             """
-            )
-            if isinstance(result, list):
-                return cast(list[object], result)
-            return [cast(object, result)]
+            SELECT
+                id, title, status, component
+            FROM spec
+            WHERE ->depends_on->spec CONTAINS $spec
+        """,
+            {"spec": RecordID("spec", spec_id)},
+        )
+        return _many(result)
+
+    async def get_impact_tree(self, spec_id: str, depth: int = 3) -> list[object]:
+        """Get the specs blocked by this spec, down to `depth` levels.
+
+        Each spec lists the specs it in turn blocks under
+        ``blocked_specs``; the whole tree comes back from one query.
+        """
+        depth = max(1, min(depth, _IMPACT_MAX_DEPTH))
+        result = await self._query(
+            _impact_tree_sql(depth), {"spec": RecordID("spec", spec_id)}
+        )
+        return _many(result)
 
     async def get_ready_specs(self) -> list[object]:
         """Get specs ready to work on (all deps completed)."""
-        async with self.connect() as db:
-            result = await db.query(
-                """
-                SELECT id, title, component
-                FROM spec
-                WHERE status IN ['draft', 'approved']
-                AND (
-                    count(->depends_on->spec) = 0
-                    OR array::all(->depends_on->spec.status, |$v| $v = 'completed')
-                )
+        result = await self._query(
             """
+            SELECT id, title, component
+            FROM spec
+            WHERE status IN ['draft', 'approved']
+            AND (
+                count(->depends_on->spec) = 0
+                OR array::all(->depends_on->spec.status, |$v| $v = 'completed')
             )
-            if isinstance(result, list):
-                return cast(list[object], result)
-            return [cast(object, result)]
+        """
+        )
+        return _many(result)
 
     # -------------------------------------------------------------------------
     # Task Operations
@@ -186,110 +340,90 @@ class LineageDB:
 
     async def start_task(self, task_id: str) -> dict[str, object]:
         """Mark task as active and update phase state."""
-        record = _record_id("task", task_id)
-        record_lit = _record_literal("task", task_id)
-
-        async with self.connect() as db:
-            # Update task status
-            _ = await db.query(
-                f"""
-                UPDATE {record} SET
-                    status = 'active',
-                    started_at = time::now()
+        # One round-trip: update the task, point phase state at it and
+        # log the status change
+        _ = await self._query(
             """
-            )
-
-            # Update phase state
-            _ = await db.query(
-                f"""
-                DELETE current_task WHERE in = phase_state:current;
-                RELATE phase_state:current->current_task->{record_lit}
-            """
-            )
-
-            # Log status change
-            _ = await db.create(
-                "status_change",
-                {
+            UPDATE $task SET
+                status = 'active',
+                started_at = time::now();
+            DELETE current_task WHERE in = phase_state:current;
+            RELATE phase_state:current->current_task->$task;
+            CREATE status_change CONTENT $status_change;
+        """,
+            {
+                "task": RecordID("task", task_id),
+                "status_change": {
                     "entity_type": "task",
                     "entity_id": task_id,
                     "old_status": "pending",
                     "new_status": "active",
                     "changed_by": "claude",
                 },
-            )
+            },
+        )
 
-            return {"status": "started", "task_id": task_id}
+        self._invalidate_task(task_id)
+        return {"status": "started", "task_id": task_id}
 
     async def complete_task(
         self, task_id: str, actual_minutes: int | None = None
     ) -> dict[str, object]:
         """Mark task as completed."""
-        record = _record_id("task", task_id)
-
-        async with self.connect() as db:
-            _ = await db.query(
-                f"""
-                UPDATE {record} SET
-                    status = 'completed',
-                    completed_at = time::now(),
-                    actual_minutes = $minutes
-            """,
-                {"minutes": actual_minutes},
-            )
+        _ = await self._query(
+            """
+            UPDATE $task SET
+                status = 'completed',
+                completed_at = time::now(),
+                actual_minutes = $minutes
+        """,
+            {"task": RecordID("task", task_id), "minutes": actual_minutes},
+        )
 
-            return {"status": "completed", "task_id": task_id}
+        self._invalidate_task(task_id)
+        return {"status": "completed", "task_id": task_id}
 
     # -------------------------------------------------------------------------
     # Context Building (for Claude)
     # -------------------------------------------------------------------------
 
+    @_cached_read("task_context")
     async def get_task_context(self, task_id: str) -> dict[str, object] | None:
         """
         Build full context for implementing a task.
 
         Returns everything Claude needs to know.
         """
-        record = _record_id("task", task_id)
-
-        async with self.connect() as db:
-            result = await db.query(
-                f"""
-                SELECT
-                    *,
-                    <-belongs_to<-plan.* AS plan,
-                    <-belongs_to<-plan->implements->spec.* AS spec,
-                    ->task_depends->task.* AS prerequisite_tasks,
-                    ->modifies->symbol.* AS target_symbols,
-                    ->modifies->symbol->references->symbol.* AS related_symbols
-                FROM {record}
+        result = await self._query(
             """
-            )
-
-            if isinstance(result, list) and result:
-                return cast(dict[str, object], result[0])
-            if isinstance(result, dict):
-                return cast(dict[str, object], result)
-            return None
-
+            SELECT
+                *,
+                <-belongs_to<-plan.* AS plan,
+                <-belongs_to<-plan->implements->spec.* AS spec,
+                ->task_depends->task.* AS prerequisite_tasks,
+                ->modifies->symbol.* AS target_symbols,
+                ->modifies->symbol->references->symbol.* AS related_symbols
+            FROM $task
+        """,
+            {"task": RecordID("task", task_id)},
+        )
+
+        return _one(result)
+
+    @_cached_read("current_context")
     async def get_current_context(self) -> dict[str, object] | None:
         """Get current phase state with full context."""
-        async with self.connect() as db:
-            result = await db.query(
-                """
-                SELECT
-                    current_phase,
-                    ->current_spec->spec.* AS spec,
-                    ->current_task->task.* AS task,
-                    ->current_session->session.* AS session
-                FROM phase_state:current
+        result = await self._query(
             """
-            )
-            if isinstance(result, list) and result:
-                return cast(dict[str, object], result[0])
-            if isinstance(result, dict):
-                return cast(dict[str, object], result)
-            return None
+            SELECT
+                current_phase,
+                ->current_spec->spec.* AS spec,
+                ->current_task->task.* AS task,
+                ->current_session->session.* AS session
+            FROM phase_state:current
+        """
+        )
+        return _one(result)
 
     # -------------------------------------------------------------------------
     # Code Change Recording
@@ -306,74 +440,55 @@ class LineageDB:
         commit_sha: str | None = None,
     ) -> dict[str, object]:
         """Record a code change linked to a task."""
-        import uuid
-
-        change_id = f"ch_{uuid.uuid4().hex[:8]}"
-        task_record_lit = _record_literal("task", task_id)
-        change_record_lit = _record_literal("change", change_id)
+        change_id = f"ch_{secrets.token_hex(4)}"
+        sql = """
+            CREATE $change CONTENT $change_data;
+            RELATE $change->performed_in->$task;
+        """
+        bindings: dict[str, object] = {
+            "change": RecordID("change", change_id),
+            "task": RecordID("task", task_id),
+            "change_data": {
+                "id": change_id,
+                "change_type": change_type,
+                "file_path": file_path,
+                "lines_added": lines_added,
+                "lines_removed": lines_removed,
+                "commit_sha": commit_sha,
+            },
+        }
 
-        async with self.connect() as db:
-            # Create change record
-            _ = await db.create(
-                change_record_lit,
+        # Link to symbol if provided, creating it if it doesn't exist
+        if symbol_fqn:
+            symbol_id = _SYMBOL_ID_SEP_RE.sub("_", symbol_fqn)
+            sql += """
+            INSERT INTO symbol {
+                id: $symbol_id,
+                fqn: $fqn,
+                name: $name,
+                file_path: $path,
+                kind: 'unknown'
+            } ON DUPLICATE KEY UPDATE updated_at = time::now();
+            RELATE $change->records->$symbol;
+            RELATE $task->modifies->$symbol SET change_type = $type;
+        """
+            bindings.update(
                 {
-                    "id": change_id,
-                    "change_type": change_type,
-                    "file_path": file_path,
-                    "lines_added": lines_added,
-                    "lines_removed": lines_removed,
-                    "commit_sha": commit_sha,
-                },
+                    "symbol": RecordID("symbol", symbol_id),
+                    "symbol_id": symbol_id,
+                    "fqn": symbol_fqn,
+                    "name": symbol_fqn.split("::")[-1],
+                    "path": file_path,
+                    "type": change_type,
+                }
             )
 
-            # Link to task
-            _ = await db.query(
-                f"""
-                RELATE {change_record_lit}->performed_in->{task_record_lit}
-            """
-            )
+        # All statements in one round-trip; the change id is generated
+        # here, so nothing depends on an earlier statement's result
+        _ = await self._query(sql, bindings)
+        self._invalidate("task_context", task_id)
 
-            # Link to symbol if provided
-            if symbol_fqn:
-                symbol_id = (
-                    symbol_fqn.replace("::", "_").replace(".", "_").replace("/", "_")
-                )
-                symbol_record_lit = _record_literal("symbol", symbol_id)
-
-                # Create symbol if not exists
-                _ = await db.query(
-                    f"""
-                    CREATE {symbol_record_lit} CONTENT {{
-                        fqn: $fqn,
-                        name: $name,
-                        file_path: $path,
-                        kind: 'unknown'
-                    }} ON DUPLICATE KEY UPDATE updated_at = time::now()
-                """,
-                    {
-                        "fqn": symbol_fqn,
-                        "name": symbol_fqn.split("::")[-1],
-                        "path": file_path,
-                    },
-                )
-
-                # Link change to symbol
-                _ = await db.query(
-                    f"""
-                    RELATE {change_record_lit}->records->{symbol_record_lit}
-                """
-                )
-
-                # Link task to symbol
-                _ = await db.query(
-                    f"""
-                    RELATE {task_record_lit}->modifies->{symbol_record_lit}
-                    SET change_type = $type
-                """,
-                    {"type": change_type},
-                )
-
-            return {"change_id": change_id}
+        return {"change_id": change_id}
 
     # -------------------------------------------------------------------------
     # Analytics
@@ -381,47 +496,48 @@ class LineageDB:
 
     async def get_velocity(self, days: int = 14) -> list[object]:
         """Get task completion velocity over time."""
-        async with self.connect() as db:
-            result = await db.query(
-                f"""
-                SELECT
-                    time::floor(completed_at, 1d) AS day,
-                    count() AS completed,
-                    math::sum(actual_minutes) AS total_minutes
-                FROM task
-                WHERE completed_at > time::now() - {days}d
-                GROUP BY day
-                ORDER BY day
+        result = await self._query(
             """
-            )
-            if isinstance(result, list):
-                return cast(list[object], result)
-            return [cast(object, result)]
-
+            SELECT
+                time::floor(completed_at, 1d) AS day,
+                count() AS completed,
+                math::sum(actual_minutes) AS total_minutes
+            FROM task
+            WHERE completed_at > time::now() - duration::from::days($days)
+            GROUP BY day
+            ORDER BY day
+        """,
+            {"days": days},
+        )
+        return _many(result)
+
+    @_cached_read("spec_progress")
     async def get_spec_progress(self, spec_id: str) -> dict[str, object] | None:
         """Get detailed progress for a spec."""
-        record = _record_id("spec", spec_id)
-
-        async with self.connect() as db:
-            result = await db.query(
-                f"""
+        result = await self._query(
+            """
+            SELECT
+                id,
+                title,
+                status,
+                count(tasks) AS total_tasks,
+                count(tasks[WHERE status = 'completed']) AS completed,
+                count(tasks[WHERE status = 'active']) AS active,
+                count(tasks[WHERE status = 'blocked']) AS blocked,
+                math::sum(tasks.actual_minutes) AS minutes_spent
+            FROM (
+                -- Walk spec -> plan -> task once; the counts filter this array
                 SELECT
                     id,
                     title,
                     status,
-                    count(<-implements<-plan<-belongs_to<-task) AS total_tasks,
-                    count(<-implements<-plan<-belongs_to<-task[WHERE status = 'completed']) AS completed,
-                    count(<-implements<-plan<-belongs_to<-task[WHERE status = 'active']) AS active,
-                    count(<-implements<-plan<-belongs_to<-task[WHERE status = 'blocked']) AS blocked,
-                    math::sum(<-implements<-plan<-belongs_to<-task.actual_minutes) AS minutes_spent
-                FROM {record}
-            """
+                    <-implements<-plan<-belongs_to<-task.* AS tasks
+                FROM $spec
             )
-            if isinstance(result, list) and result:
-                return cast(dict[str, object], result[0])
-            if isinstance(result, dict):
-                return cast(dict[str, object], result)
-            return None
+        """,
+            {"spec": RecordID("spec", spec_id)},
+        )
+        return _one(result)
 
 
 # -----------------------------------------------------------------------------
@@ -429,12 +545,70 @@ class LineageDB:
 # -----------------------------------------------------------------------------
 
 
+# Only the start of each spec is sent for dependency analysis
+_SPEC_HEAD_CHARS = 1000
+
+# spec.md path -> (mtime_ns, size, head)
+_SPEC_HEAD_CACHE: dict[str, tuple[int, int, str]] = {}
+
+
+def _load_spec_head(path: str) -> str | None:
+    """First _SPEC_HEAD_CHARS characters of a spec file, or None if missing."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read(_SPEC_HEAD_CHARS)
+    except FileNotFoundError:
+        return None
+
+
+async def _read_spec_heads(paths: list[str]) -> list[str | None]:
+    """Heads of several spec files, None for any that don't exist.
+
+    Each file is read once and reused until its mtime or size changes;
+    files that do need reading are read concurrently in worker threads.
+    """
+    heads: list[str | None] = [None] * len(paths)
+    misses: list[tuple[int, str, tuple[int, int]]] = []
+    for i, path in enumerate(paths):
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        token = (st.st_mtime_ns, st.st_size)
+        cached = _SPEC_HEAD_CACHE.get(path)
+        if cached is not None and cached[:2] == token:
+            heads[i] = cached[2]
+        else:
+            misses.append((i, path, token))
+
+    if misses:
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(_load_spec_head, path) for _, path, _ in misses)
+        )
+        for (i, path, token), head in zip(misses, loaded):
+            heads[i] = head
+            if head is not None:
+                _SPEC_HEAD_CACHE[path] = (*token, head)
+    return heads
+
+
 def create_mcp_server():
-    """Create FastMCP server with SurrealDB backend."""
+    """Create FastMCP server with SurrealDB backend.
+
+    The server and its LineageDB are shared by repeat calls from the same
+    project directory, so the migration check and read cache persist
+    between them. Each tool call opens and closes its own connection, so
+    the server never holds the database lock between calls.
+    """
+    return _mcp_server_for(Path.cwd() / ".spectrena" / "lineage.db")
+
+
+@functools.lru_cache(maxsize=1)
+def _mcp_server_for(db_path: Path):
     from fastmcp import FastMCP
 
     mcp = FastMCP("spectrena")
-    db = LineageDB()
+    db = LineageDB(db_path)
 
     @mcp.tool()
     async def phase_get() -> dict[str, object] | None:
@@ -466,9 +640,9 @@ def create_mcp_server():
         return await db.record_change(task_id, file_path, change_type, symbol_fqn)
 
     @mcp.tool()
-    async def impact_analysis(spec_id: str) -> dict[str, object]:
-        """Find all specs that depend on this one."""
-        blocked = await db.get_blocked_by(spec_id)
+    async def impact_analysis(spec_id: str, depth: int = 3) -> dict[str, object]:
+        """Find all specs that depend on this one, transitively up to depth."""
+        blocked = await db.get_impact_tree(spec_id, depth)
         return {"spec_id": spec_id, "blocked_specs": blocked}
 
     @mcp.tool()
@@ -481,6 +655,17 @@ def create_mcp_server():
         """Get task completion velocity."""
         return await db.get_velocity(days)
 
+    @mcp.tool()
+    async def cache_stats() -> dict[str, object]:
+        """Show lineage read cache statistics."""
+        return db.cache_stats()
+
+    @mcp.tool()
+    async def cache_clear() -> dict[str, object]:
+        """Clear the lineage read cache."""
+        db.cache_clear()
+        return {"status": "cleared"}
+
     @mcp.tool()
     async def dep_graph_analyze() -> dict[str, object]:
         """
@@ -489,8 +674,6 @@ def create_mcp_server():
         Call this when user asks to analyze or create dependency graph.
         Returns all specs for Claude to analyze and generate Mermaid graph.
         """
-        from pathlib import Path
-        
         specs_dir = Path.cwd() / "specs"
         specs = []
         
@@ -500,16 +683,18 @@ def create_mcp_server():
                 "instruction": "No specs directory found. Run 'spectrena init' first."
             }
         
-        for spec_dir in sorted(specs_dir.iterdir()):
-            if not spec_dir.is_dir():
-                continue
-            spec_md = spec_dir / "spec.md"
-            if spec_md.exists():
-                content = spec_md.read_text()
-                # Extract just the first 1000 chars for analysis
+        with os.scandir(specs_dir) as entries:
+            spec_dirs = sorted(
+                (entry.name, entry.path) for entry in entries if entry.is_dir()
+            )
+        heads = await _read_spec_heads(
+            [os.path.join(path, "spec.md") for _, path in spec_dirs]
+        )
+        for (name, _), content in zip(spec_dirs, heads):
+            if content is not None:
                 specs.append({
-                    "id": spec_dir.name,
-                    "content": content[:1000]
+                    "id": name,
+                    "content": content
                 })
         
         return {
@@ -539,14 +724,26 @@ def create_mcp_server():
         # Count edges for confirmation
         edge_count = mermaid_graph.count("-->")
         
-        # Also sync to lineage DB if enabled
-        # TODO: Parse and store edges in database
-        
-        return {
+        result: dict[str, object] = {
             "status": "saved",
             "path": str(deps_file),
             "edge_count": edge_count,
             "message": f"Saved dependency graph with {edge_count} edges to {deps_file}"
         }
 
+        # Also sync to lineage DB if enabled
+        from spectrena.config import Config
+
+        if Config.load(Path.cwd()).lineage.enabled:
+            from spectrena.worktrees import parse_mermaid_deps
+
+            # Standalone nodes are included so their removed edges go too
+            graph = parse_mermaid_deps(deps_file)
+            edges = list(dict.fromkeys(
+                (spec, dep, "hard") for spec, deps in graph.items() for dep in deps
+            ))
+            result["synced_edges"] = await db.set_dependencies(edges, list(graph))
+
+        return result
+
     return mcp
@@ -11,6 +11,11 @@ class SchemaVersionError(Exception):
     pass
 
 
+class MigrationError(Exception):
+    """A migration statement failed; the migration was rolled back."""
+    pass
+
+
 # Migration functions: version -> SQL or async function
 MIGRATIONS: dict[int, str | Callable] = {
     1: """
@@ -82,6 +87,94 @@ MIGRATIONS: dict[int, str | Callable] = {
 CURRENT_SCHEMA_VERSION = max(MIGRATIONS.keys()) if MIGRATIONS else 0
 
 
+def _split_statements(sql: str) -> tuple[str, ...]:
+    """Split a SurrealQL script on ';', ignoring quoted strings and -- comments."""
+    statements = []
+    start = 0
+    quote = None
+    i = 0
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "-" and sql.startswith("--", i):
+            newline = sql.find("\n", i)
+            i = n if newline == -1 else newline
+            continue
+        elif ch == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+        i += 1
+    statements.append(sql[start:])
+
+    # Drop empty and comment-only chunks
+    return tuple(
+        stripped
+        for stripped in (statement.strip() for statement in statements)
+        if any(
+            line.strip() and not line.strip().startswith("--")
+            for line in stripped.splitlines()
+        )
+    )
+
+
+# Statement lists for SQL migrations, split once at import
+_MIGRATION_STATEMENTS: dict[int, tuple[str, ...]] = {
+    version: _split_statements(migration)
+    for version, migration in MIGRATIONS.items()
+    if isinstance(migration, str)
+}
+
+# Whole SQL migrations as one transactional script, sent in a single query
+_MIGRATION_SCRIPTS: dict[int, str] = {
+    version: "BEGIN TRANSACTION;\n"
+    + "".join(f"{statement};\n" for statement in statements)
+    + "COMMIT TRANSACTION;"
+    for version, statements in _MIGRATION_STATEMENTS.items()
+}
+
+
+# Error SurrealDB reports for the statements of a transaction that was
+# rolled back because another statement in it failed
+_ROLLED_BACK_ERROR = "not executed due to a failed transaction"
+
+
+def _check_script_response(version: int, response: dict) -> None:
+    """Raise MigrationError if any statement of a migration script failed.
+
+    A multi-statement query doesn't raise: SurrealDB returns a status for
+    each statement, so the failing one is found from those rather than by
+    re-running anything.
+    """
+    error = response.get("error")
+    if error:
+        if isinstance(error, dict):
+            error = error.get("message", error)
+        raise MigrationError(str(error))
+
+    statements = _MIGRATION_STATEMENTS[version]
+    failed = [
+        (i, str(result.get("result")))
+        for i, result in enumerate(response.get("result") or [])
+        if result.get("status") == "ERR"
+    ]
+    if not failed:
+        return
+
+    # Report the statement that caused the rollback, not its casualties
+    i, message = next(
+        (f for f in failed if _ROLLED_BACK_ERROR not in f[1]), failed[0]
+    )
+    statement = statements[i] if i < len(statements) else "?"
+    raise MigrationError(f"{message}\n  Statement: {statement[:100]}")
+
+
 async def get_schema_version(db) -> int:
     """Get current schema version from database."""
     try:
@@ -143,17 +236,12 @@ async def ensure_schema(db, backup: bool = True) -> None:
         if callable(migration):
             await migration(db)
         else:
-            # Split into statements and execute
-            statements = migration.split(';')
-            for statement in statements:
-                statement = statement.strip()
-                if statement:
-                    try:
-                        await db.query(statement)
-                    except Exception as e:
-                        console.print(f"  [red]Error in migration {version}:[/red] {e}")
-                        console.print(f"  [dim]Statement: {statement[:100]}...[/dim]")
-                        raise
+            response = await db.query_raw(_MIGRATION_SCRIPTS[version])
+            try:
+                _check_script_response(version, response)
+            except MigrationError as e:
+                console.print(f"  [red]Error in migration {version}:[/red] {e}")
+                raise
 
         console.print(f"  [green]✓[/green] Migration {version} complete")
 
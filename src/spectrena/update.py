@@ -1,24 +1,43 @@
 """Spectrena project update logic."""
 
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
+import fnmatch
+import functools
 import hashlib
+import os
+import re
 import shutil
 import json
-import difflib
 import tempfile
 import zipfile
-import io
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 from rich.console import Console
+from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import typer
 
+if TYPE_CHECKING:
+    import ssl
+
 console = Console()
 
+# Optional C matcher for template diffs (pip install cdifflib)
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher as _SequenceMatcher
+
+# Downloaded archives above this size are spooled to disk
+_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+_COPY_BUFSIZE = 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 # GitHub repository for template downloads
 GITHUB_REPO_OWNER = "rghsoftware"
 GITHUB_REPO_NAME = "spectrena"
@@ -67,6 +86,13 @@ class FileUpdate:
     old_hash: Optional[str] = None
     new_hash: Optional[str] = None
     diff: Optional[str] = None
+    # New template text, kept for merge candidates so it's read only once
+    new_content: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def identical(self) -> bool:
+        """Whether the project file already matches the new template."""
+        return self.new_hash is not None and self.old_hash == self.new_hash
 
 
 @dataclass
@@ -75,50 +101,161 @@ class UpdatePlan:
     from_version: str
     to_version: str
     files: list[FileUpdate] = field(default_factory=list)
+    # Project file hashes keyed by rel path; see cached_file_hash()
+    hash_cache: dict[str, list] = field(default_factory=dict, repr=False)
+
+    @property
+    def counts(self) -> Counter[UpdateAction]:
+        """Number of files per action, counted in one pass."""
+        return Counter(f.action for f in self.files)
 
     @property
     def preserve_count(self) -> int:
-        return sum(1 for f in self.files if f.action == UpdateAction.PRESERVE)
+        return self.counts[UpdateAction.PRESERVE]
 
     @property
     def update_count(self) -> int:
-        return sum(1 for f in self.files if f.action == UpdateAction.UPDATE)
+        return self.counts[UpdateAction.UPDATE]
 
     @property
     def merge_count(self) -> int:
-        return sum(1 for f in self.files if f.action == UpdateAction.MERGE)
+        return self.counts[UpdateAction.MERGE]
 
     @property
     def add_count(self) -> int:
-        return sum(1 for f in self.files if f.action == UpdateAction.ADD)
+        return self.counts[UpdateAction.ADD]
+
+
+# Hashes are change-detection tokens, not a security boundary, so use the
+# faster BLAKE2b. Hashes saved before "hash_algo" was recorded are SHA-256.
+HASH_ALGO = "blake2b"
+_LEGACY_HASH_ALGO = "sha256"
+_HASHERS: dict[str, Callable] = {
+    "blake2b": lambda: hashlib.blake2b(digest_size=6),
+    "sha256": hashlib.sha256,
+}
 
+# Files up to this size are hashed from a single read()
+_SMALL_FILE_SIZE = 64 * 1024
 
-def file_hash(path: Path) -> Optional[str]:
-    """Get SHA256 hash of file contents."""
-    if not path.exists():
+
+def file_hash(path: Path | str, algo: str = HASH_ALGO) -> Optional[str]:
+    """Get a short hash of file contents, or None if the file doesn't exist."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= _SMALL_FILE_SIZE:
+                # Most templates are small; skip file_digest's buffer setup
+                hasher = _HASHERS[algo]()
+                hasher.update(f.read())
+                return hasher.hexdigest()[:12]
+            # Streams the file in fixed-size blocks rather than reading it whole
+            return hashlib.file_digest(f, _HASHERS[algo]).hexdigest()[:12]
+    except FileNotFoundError:
+        return None
+
+
+def cached_file_hash(
+    path: Path,
+    rel_path: str,
+    previous: dict[str, list],
+    cache: dict[str, list],
+    algo: str = HASH_ALGO,
+) -> Optional[str]:
+    """file_hash() that reuses a previous run's digest if the file is unchanged.
+
+    Entries are [st_dev, st_ino, st_mtime_ns, st_size, algo, digest]; a
+    file whose stat and algorithm still match is not read again. Digests
+    for files that exist are recorded in `cache`.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         return None
-    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    token = [st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, algo]
+    entry = previous.get(rel_path)
+    if entry is not None and entry[:5] == token:
+        digest = entry[5]
+    else:
+        digest = file_hash(path, algo)
+    if digest is not None:
+        cache[rel_path] = [*token, digest]
+    return digest
+
+
+def _iter_files(
+    root: Path, prune: Optional[Callable[[str], bool]] = None
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yield (relative path, entry) for every non-directory under root.
+
+    Walks with os.scandir in the same order as root.rglob("*"), so entry
+    types come from the directory listing rather than a stat per path.
+    Symlinked directories are skipped: neither yielded nor descended into.
+    Directories for which prune(rel_path) is true are yielded themselves
+    instead of being descended into.
+    """
+    stack = [(os.fspath(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if prune is not None and prune(rel_path):
+                        yield rel_path, entry
+                    else:
+                        subdirs.append((entry.path, rel_path + os.sep))
+                elif not entry.is_dir():
+                    yield rel_path, entry
+        stack.extend(reversed(subdirs))
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_patterns(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """One regex matching any of the glob patterns, as fnmatch would."""
+    return re.compile(
+        "|".join(fnmatch.translate(p) for p in patterns) or "(?!)",
+        # fnmatch folds case where the OS does (Windows)
+        re.IGNORECASE if os.path.normcase("A") == "a" else 0,
+    )
+
+
+_PRESERVE_RE = _compile_patterns(tuple(PRESERVE_PATTERNS))
+# Directories whose whole subtree is preserved ("specs/*" -> "specs/")
+_PRESERVE_DIR_PREFIXES = tuple(
+    p[:-1] for p in PRESERVE_PATTERNS
+    if p.endswith("/*") and not any(c in p[:-2] for c in "*?[")
+)
+_UPDATE_RE = _compile_patterns(tuple(UPDATE_PATTERNS))
+_MERGE_RE = _compile_patterns(tuple(MERGE_PATTERNS))
 
 
 def matches_pattern(path: str, patterns: list[str]) -> bool:
     """Check if path matches any glob pattern."""
-    from fnmatch import fnmatch
-    return any(fnmatch(path, p) for p in patterns)
+    regex = _compile_patterns(tuple(patterns))
+    return regex.match(path.replace(os.sep, "/")) is not None
+
+
+def _is_preserved_dir(rel_path: str) -> bool:
+    """Whether everything under a directory is preserved user content."""
+    return (rel_path.replace(os.sep, "/") + "/").startswith(_PRESERVE_DIR_PREFIXES)
 
 
 def categorize_file(rel_path: str, exists: bool, modified: bool) -> tuple[UpdateAction, str]:
     """Determine action for a file."""
+    # Patterns are written with '/'
+    rel_path = rel_path.replace(os.sep, "/")
 
-    if matches_pattern(rel_path, PRESERVE_PATTERNS):
+    if _PRESERVE_RE.match(rel_path):
         return UpdateAction.PRESERVE, "User content - never modified"
 
-    if matches_pattern(rel_path, UPDATE_PATTERNS):
+    if _UPDATE_RE.match(rel_path):
         if exists:
             return UpdateAction.UPDATE, "Framework file - will be updated"
         else:
             return UpdateAction.ADD, "New framework file"
 
-    if matches_pattern(rel_path, MERGE_PATTERNS):
+    if _MERGE_RE.match(rel_path):
         if not exists:
             return UpdateAction.ADD, "New template"
         if modified:
@@ -132,12 +269,48 @@ def categorize_file(rel_path: str, exists: bool, modified: bool) -> tuple[Update
     return UpdateAction.ADD, "New file"
 
 
-def load_original_hashes(project_path: Path) -> dict[str, str]:
-    """Load original template hashes from last update."""
+def _write_if_changed(path: Path, text: str) -> None:
+    """Write text to path unless it already holds exactly that.
+
+    Keeps the mtime of bookkeeping files stable across no-op updates.
+    """
+    try:
+        if path.read_text() == text:
+            return
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    path.write_text(text)
+
+
+def load_hash_cache(project_path: Path) -> dict[str, list]:
+    """Load project file hashes cached by the last update."""
+    cache_file = project_path / ".spectrena" / ".hash-cache.json"
+    try:
+        return json.loads(cache_file.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_hash_cache(project_path: Path, cache: dict[str, list]) -> None:
+    """Save project file hashes for the next update."""
+    cache_file = project_path / ".spectrena" / ".hash-cache.json"
+    _write_if_changed(cache_file, json.dumps(cache))
+
+
+def load_original_hashes(project_path: Path) -> tuple[str, dict[str, str]]:
+    """Load original template hashes from last update.
+
+    Returns the hash algorithm they were computed with and the hashes;
+    hashes from an unknown algorithm are dropped.
+    """
     hash_file = project_path / ".spectrena" / ".template-hashes.json"
-    if hash_file.exists():
-        return json.loads(hash_file.read_text())
-    return {}
+    if not hash_file.exists():
+        return HASH_ALGO, {}
+    hashes = json.loads(hash_file.read_text())
+    algo = hashes.pop("hash_algo", _LEGACY_HASH_ALGO)
+    if algo not in _HASHERS:
+        return HASH_ALGO, {}
+    return algo, hashes
 
 
 def save_original_hashes(
@@ -146,21 +319,28 @@ def save_original_hashes(
     new_template_path: Path,
 ) -> None:
     """Save template hashes for detecting future modifications."""
-    hashes = {}
+    hashes = {"hash_algo": HASH_ALGO}
     for file_update in plan.files:
-        if file_update.action in (UpdateAction.UPDATE, UpdateAction.ADD):
+        # Identical files are skipped but still match the new template
+        if file_update.action in (UpdateAction.UPDATE, UpdateAction.ADD) or file_update.identical:
             hashes[file_update.path] = file_update.new_hash
 
     hash_file = project_path / ".spectrena" / ".template-hashes.json"
-    hash_file.write_text(json.dumps(hashes, indent=2))
+    # Sorted so the file doesn't churn with directory listing order
+    _write_if_changed(hash_file, json.dumps(hashes, indent=2, sort_keys=True))
+
 
+def generate_diff(old_file: Path, new_file: Path, new_text: Optional[str] = None) -> str:
+    """Generate unified diff between files.
 
-def generate_diff(old_file: Path, new_file: Path) -> str:
-    """Generate unified diff between files."""
+    new_text, when given, is used instead of reading new_file again.
+    """
+    if new_text is None:
+        new_text = new_file.read_text()
     old_lines = old_file.read_text().splitlines(keepends=True)
-    new_lines = new_file.read_text().splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
 
-    diff = difflib.unified_diff(
+    diff = _unified_diff(
         old_lines, new_lines,
         fromfile=f"current/{old_file.name}",
         tofile=f"updated/{new_file.name}",
@@ -169,6 +349,50 @@ def generate_diff(old_file: Path, new_file: Path) -> str:
     return "".join(diff)
 
 
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff hunk range, as difflib formats it."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _unified_diff(
+    a: list[str], b: list[str], fromfile: str, tofile: str, n: int = 3
+) -> Iterator[str]:
+    """difflib.unified_diff() driven by _SequenceMatcher.
+
+    Output is identical to difflib's; the matcher is the C implementation
+    from cdifflib when it's installed.
+    """
+    started = False
+    for group in _SequenceMatcher(None, a, b).get_grouped_opcodes(n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+
+        first, last = group[0], group[-1]
+        yield (
+            f"@@ -{_format_range(first[1], last[2])} "
+            f"+{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
 def create_update_plan(
     project_path: Path,
     new_template_path: Path,
@@ -180,25 +404,68 @@ def create_update_plan(
     plan = UpdatePlan(from_version=current_version, to_version=new_version)
 
     # Track original template hashes for detecting modifications
-    original_hashes = load_original_hashes(project_path)
-
-    # Scan new template files
-    for new_file in new_template_path.rglob("*"):
-        if new_file.is_dir():
-            continue
-
-        rel_path = str(new_file.relative_to(new_template_path))
-        existing_file = project_path / rel_path
+    original_algo, original_hashes = load_original_hashes(project_path)
+    previous_hashes = load_hash_cache(project_path)
+
+    # Scan new template files; preserved subtrees are recorded as a
+    # single entry without being walked or hashed
+    files = []
+    for rel_path, entry in _iter_files(new_template_path, prune=_is_preserved_dir):
+        if entry.is_dir(follow_symlinks=False):
+            plan.files.append(FileUpdate(
+                path=rel_path + os.sep,
+                action=UpdateAction.PRESERVE,
+                reason="User content - never modified",
+            ))
+        else:
+            files.append((rel_path, entry.path, project_path / rel_path))
+
+    def hash_pair(
+        item: tuple[str, str, Path],
+    ) -> tuple[bool, Optional[str], Optional[str]]:
+        """(exists, old_hash, new_hash), hashing only what categorize_file needs."""
+        rel_path, new_file, existing_file = item
+        path = rel_path.replace(os.sep, "/")
+        if _PRESERVE_RE.match(path):
+            return False, None, None  # Preserved whatever its state
+
+        if _UPDATE_RE.match(path) or _MERGE_RE.match(path):
+            # Compared with the new hash to skip identical files; for merge
+            # candidates it also decides whether the user modified the file,
+            # so it must use the algorithm the original hashes were made with
+            algo = HASH_ALGO if _UPDATE_RE.match(path) else original_algo
+            old_hash = cached_file_hash(
+                existing_file, rel_path, previous_hashes, plan.hash_cache, algo
+            )
+            return old_hash is not None, old_hash, file_hash(new_file)
+
+        # Unknown files only need to know if they exist; the new hash is
+        # recorded for anything that will be copied
+        exists = os.path.exists(existing_file)
+        if exists:
+            return exists, None, None  # Unknown existing file is preserved
+        return exists, None, file_hash(new_file)
+
+    # hashlib releases the GIL while digesting, so hash files concurrently;
+    # map() keeps results in walk order
+    workers = min(len(files), os.cpu_count() or 1)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            hashes = list(executor.map(hash_pair, files))
+    else:
+        hashes = list(map(hash_pair, files))
 
-        exists = existing_file.exists()
-        old_hash = file_hash(existing_file)
-        new_hash = file_hash(new_file)
+    for (rel_path, new_file, existing_file), hashed in zip(files, hashes):
+        exists, old_hash, new_hash = hashed
 
         # Check if user modified the file from original
         original_hash = original_hashes.get(rel_path)
         modified = exists and old_hash != original_hash
 
-        action, reason = categorize_file(rel_path, exists, modified)
+        if exists and new_hash is not None and old_hash == new_hash:
+            action, reason = UpdateAction.PRESERVE, "Identical to new template"
+        else:
+            action, reason = categorize_file(rel_path, exists, modified)
 
         update = FileUpdate(
             path=rel_path,
@@ -210,7 +477,9 @@ def create_update_plan(
 
         # Generate diff for merge candidates
         if action == UpdateAction.MERGE and exists:
-            update.diff = generate_diff(existing_file, new_file)
+            new_path = Path(new_file)
+            update.new_content = new_path.read_text()
+            update.diff = generate_diff(existing_file, new_path, update.new_content)
 
         plan.files.append(update)
 
@@ -224,16 +493,17 @@ def display_update_plan(plan: UpdatePlan) -> None:
     table.add_column("Action", style="cyan")
     table.add_column("Count", justify="right")
 
-    table.add_row("Preserve", str(plan.preserve_count), style="dim")
-    table.add_row("Update", str(plan.update_count), style="green")
-    table.add_row("Add", str(plan.add_count), style="cyan")
-    table.add_row("Merge (review needed)", str(plan.merge_count), style="yellow")
+    counts = plan.counts
+    table.add_row("Preserve", str(counts[UpdateAction.PRESERVE]), style="dim")
+    table.add_row("Update", str(counts[UpdateAction.UPDATE]), style="green")
+    table.add_row("Add", str(counts[UpdateAction.ADD]), style="cyan")
+    table.add_row("Merge (review needed)", str(counts[UpdateAction.MERGE]), style="yellow")
 
     console.print(table)
     console.print()
 
     # Show files that need review
-    if plan.merge_count > 0:
+    if counts[UpdateAction.MERGE] > 0:
         console.print("[yellow]Files requiring review:[/yellow]")
         for f in plan.files:
             if f.action == UpdateAction.MERGE:
@@ -250,7 +520,7 @@ def write_pending_updates(
 
     output = project_path / ".spectrena" / "pending-updates.md"
 
-    lines = [
+    header = [
         "# Pending Template Updates",
         "",
         "These files have been modified from the original template.",
@@ -260,59 +530,114 @@ def write_pending_updates(
         "",
     ]
 
-    for update in pending:
-        lines.extend([
-            f"## {update.path}",
-            "",
-            f"**Your version hash:** `{update.old_hash}`",
-            f"**New version hash:** `{update.new_hash}`",
-            "",
-            "### Diff",
-            "",
-            "```diff",
-            update.diff or "(diff not available)",
-            "```",
-            "",
-            "### New Version Content",
-            "",
-            "```markdown",
-            (new_template_path / update.path).read_text(),
-            "```",
-            "",
-            "---",
-            "",
-        ])
-
-    output.write_text("\n".join(lines))
+    # Written section by section so only one file's content is held at a time
+    with output.open("w") as fh:
+        fh.write("\n".join(header))
+        for update in pending:
+            fh.write("\n" + "\n".join([
+                f"## {update.path}",
+                "",
+                f"**Your version hash:** `{update.old_hash}`",
+                f"**New version hash:** `{update.new_hash}`",
+                "",
+                "### Diff",
+                "",
+                "```diff",
+                update.diff or "(diff not available)",
+                "```",
+                "",
+                "### New Version Content",
+                "",
+                "```markdown",
+                "",
+            ]))
+            if update.new_content is not None:
+                fh.write(update.new_content)
+            else:
+                with (new_template_path / update.path).open() as src:
+                    shutil.copyfileobj(src, fh)
+            fh.write("\n```\n\n---\n")
+
     console.print(f"\n[yellow]Review needed:[/yellow] {len(pending)} files")
     console.print(f"Run [cyan]/spectrena.review-updates[/cyan] to merge changes")
 
 
-def apply_update_plan(plan: UpdatePlan, project_path: Path, new_template_path: Path) -> None:
-    """Apply the update plan."""
+def _copy_file(src: Path, dst: Path) -> None:
+    """shutil.copy2(), using copy_file_range where the OS has it.
 
-    pending_merges = []
+    copy_file_range lets the kernel share blocks on copy-on-write
+    filesystems (btrfs, XFS) instead of duplicating the data.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining > 0:
+                raise OSError("short copy")
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # e.g. cross-device on older kernels; copy the usual way
+    shutil.copy2(src, dst)
 
-    for file_update in plan.files:
-        src = new_template_path / file_update.path
-        dst = project_path / file_update.path
 
-        if file_update.action == UpdateAction.PRESERVE:
-            console.print(f"  [dim]SKIP[/dim] {file_update.path}")
+def _remember_hash(plan: UpdatePlan, dst: Path, file_update: FileUpdate) -> None:
+    """Cache a copied file's digest, already known from the template."""
+    if file_update.new_hash is None:
+        return
+    st = dst.stat()
+    plan.hash_cache[file_update.path] = [
+        st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, HASH_ALGO,
+        file_update.new_hash,
+    ]
+
 
-        elif file_update.action == UpdateAction.UPDATE:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            console.print(f"  [green]UPDATE[/green] {file_update.path}")
+# Per-file log labels for apply_update_plan
+_APPLY_LABELS = {
+    UpdateAction.PRESERVE: ("SKIP", "dim"),
+    UpdateAction.UPDATE: ("UPDATE", "green"),
+    UpdateAction.ADD: ("ADD", "cyan"),
+    UpdateAction.MERGE: ("REVIEW", "yellow"),
+}
 
-        elif file_update.action == UpdateAction.ADD:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            console.print(f"  [cyan]ADD[/cyan] {file_update.path}")
 
-        elif file_update.action == UpdateAction.MERGE:
-            pending_merges.append(file_update)
-            console.print(f"  [yellow]REVIEW[/yellow] {file_update.path}")
+def apply_update_plan(plan: UpdatePlan, project_path: Path, new_template_path: Path) -> None:
+    """Apply the update plan."""
+
+    pending_merges = []
+
+    # Log lines are built as styled Text (no markup parsing) and printed
+    # in one call, even if a copy fails part way
+    log: list[Text] = []
+    try:
+        # Create each destination directory once rather than per file
+        copies = (UpdateAction.UPDATE, UpdateAction.ADD)
+        for parent in {
+            (project_path / f.path).parent for f in plan.files if f.action in copies
+        }:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        for file_update in plan.files:
+            src = new_template_path / file_update.path
+            dst = project_path / file_update.path
+
+            if file_update.action in copies:
+                _copy_file(src, dst)
+                _remember_hash(plan, dst, file_update)
+
+            elif file_update.action == UpdateAction.MERGE:
+                pending_merges.append(file_update)
+
+            label, style = _APPLY_LABELS[file_update.action]
+            log.append(Text.assemble("  ", (label, style), f" {file_update.path}"))
+    finally:
+        if log:
+            console.print(Text("\n").join(log))
 
     # Write pending merges for Claude review
     if pending_merges:
@@ -320,6 +645,7 @@ def apply_update_plan(plan: UpdatePlan, project_path: Path, new_template_path: P
 
     # Save new hashes for future updates
     save_original_hashes(project_path, plan, new_template_path)
+    save_hash_cache(project_path, plan.hash_cache)
 
 
 def get_current_version(project_path: Path) -> str:
@@ -333,12 +659,12 @@ def get_current_version(project_path: Path) -> str:
 def save_version(project_path: Path, version: str) -> None:
     """Save spectrena version to project."""
     version_file = project_path / ".spectrena" / ".version"
-    version_file.write_text(version)
+    _write_if_changed(version_file, version)
 
 
 def get_latest_version() -> str:
     """Fetch latest release version from GitHub."""
-    import urllib.request
+    import httpx
     import ssl
 
     url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases/latest"
@@ -347,24 +673,25 @@ def get_latest_version() -> str:
         # Create SSL context
         context = ssl.create_default_context()
 
-        request = urllib.request.Request(
+        response = httpx.get(
             url,
             headers={
                 "Accept": "application/vnd.github.v3+json",
                 "User-Agent": "spectrena-cli",
-            }
+            },
+            timeout=30,
+            verify=context,
+            follow_redirects=True,
         )
-
-        with urllib.request.urlopen(request, timeout=30, context=context) as response:
-            data = json.loads(response.read().decode())
-            tag = data.get("tag_name", "")
-            # Strip 'v' prefix if present
-            return tag.lstrip("v") if tag else "latest"
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+        response.raise_for_status()
+        tag = response.json().get("tag_name", "")
+        # Strip 'v' prefix if present
+        return tag.lstrip("v") if tag else "latest"
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
             console.print("[yellow]Warning:[/yellow] No releases found, using 'latest' tag")
         else:
-            console.print(f"[yellow]Warning:[/yellow] Could not fetch latest version: HTTP {e.code}")
+            console.print(f"[yellow]Warning:[/yellow] Could not fetch latest version: HTTP {e.response.status_code}")
         return "latest"
     except Exception as e:
         console.print(f"[yellow]Warning:[/yellow] Could not fetch latest version: {e}")
@@ -414,6 +741,38 @@ def detect_agent_and_script(project_path: Path) -> tuple[str, str]:
     return agent, script_type
 
 
+def _release_asset_digest(
+    version: str, filename: str, context: "ssl.SSLContext"
+) -> Optional[str]:
+    """SHA-256 GitHub publishes for a release asset, or None if unavailable."""
+    import httpx
+
+    api_url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases"
+    url = f"{api_url}/latest" if version == "latest" else f"{api_url}/tags/v{version}"
+
+    try:
+        response = httpx.get(
+            url,
+            headers={
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "spectrena-cli",
+            },
+            timeout=30,
+            verify=context,
+            follow_redirects=True,
+        )
+        response.raise_for_status()
+        assets = response.json().get("assets", [])
+    except (httpx.HTTPError, ValueError):
+        return None  # Verification is best effort; older releases lack digests
+
+    for asset in assets:
+        if asset.get("name") == filename:
+            algo, _, digest = (asset.get("digest") or "").partition(":")
+            return digest if algo == "sha256" and digest else None
+    return None
+
+
 def download_template(
     version: str,
     dest_path: Path,
@@ -421,7 +780,7 @@ def download_template(
     script_type: str = "sh",
 ) -> None:
     """Download template files from GitHub release."""
-    import urllib.request
+    import httpx
     import ssl
 
     # Construct download URL
@@ -438,16 +797,23 @@ def download_template(
     console.print(f"  [dim]Downloading from {url}[/dim]")
 
     context = ssl.create_default_context()
+    expected_digest = _release_asset_digest(version, filename, context)
 
     try:
-        request = urllib.request.Request(
+        # Hashed as it arrives, so verifying costs no extra pass
+        hasher = hashlib.sha256()
+        with httpx.stream(
+            "GET",
             url,
-            headers={"User-Agent": "spectrena-cli"}
-        )
-
-        with urllib.request.urlopen(request, timeout=120, context=context) as response:
+            headers={"User-Agent": "spectrena-cli"},
+            timeout=120,
+            verify=context,
+            follow_redirects=True,
+        ) as response:
+            response.raise_for_status()
             total_size = int(response.headers.get("content-length", 0))
-            zip_data = io.BytesIO()
+            # Small archives stay in memory; large ones spill to a temp file
+            zip_data = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
 
             if total_size > 0:
                 with Progress(
@@ -457,20 +823,24 @@ def download_template(
                     console=console,
                 ) as progress:
                     task = progress.add_task("Downloading...", total=total_size)
-                    while True:
-                        chunk = response.read(8192)
-                        if not chunk:
-                            break
+                    for chunk in response.iter_bytes(_DOWNLOAD_CHUNK_SIZE):
                         zip_data.write(chunk)
-                        progress.update(task, advance=len(chunk))
+                        hasher.update(chunk)
+                        progress.update(task, completed=response.num_bytes_downloaded)
             else:
-                zip_data.write(response.read())
+                for chunk in response.iter_bytes(_COPY_BUFSIZE):
+                    zip_data.write(chunk)
+                    hasher.update(chunk)
+
+        if expected_digest and hasher.hexdigest() != expected_digest:
+            zip_data.close()
+            raise ValueError(f"{filename} does not match its published SHA-256")
 
         # Extract to destination
         dest_path.mkdir(parents=True, exist_ok=True)
         zip_data.seek(0)
 
-        with zipfile.ZipFile(zip_data, 'r') as zf:
+        with zip_data, zipfile.ZipFile(zip_data, 'r') as zf:
             # Extract all files, stripping top-level directory if present
             namelist = zf.namelist()
 
@@ -485,6 +855,8 @@ def download_template(
             if len(top_dirs) == 1:
                 strip_prefix = list(top_dirs)[0] + "/"
 
+            # Keyed by target so a repeated member is written once, last wins
+            targets: dict[Path, str] = {}
             for member in namelist:
                 # Skip directories
                 if member.endswith('/'):
@@ -499,21 +871,35 @@ def download_template(
                 if not relative_path:
                     continue
 
-                # Extract file
-                target = dest_path / relative_path
-                target.parent.mkdir(parents=True, exist_ok=True)
+                targets[dest_path / relative_path] = member
 
+            # Create each directory once rather than per file
+            for parent in {target.parent for target in targets}:
+                parent.mkdir(parents=True, exist_ok=True)
+
+            def extract(item: tuple[Path, str]) -> None:
+                target, member = item
                 with zf.open(member) as src, open(target, 'wb') as dst:
-                    dst.write(src.read())
+                    shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+
+            # zlib releases the GIL while inflating, so members extract
+            # concurrently; ZipFile serializes reads of the archive itself
+            workers = min(len(targets), os.cpu_count() or 1)
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(extract, targets.items()))
+            else:
+                for item in targets.items():
+                    extract(item)
 
         console.print(f"  [green]✓[/green] Downloaded template")
 
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
             console.print(f"[red]Error:[/red] Version {version} not found for {agent}-{script_type}")
             console.print(f"Check available versions: https://github.com/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases")
         else:
-            console.print(f"[red]Error:[/red] Download failed: HTTP {e.code}")
+            console.print(f"[red]Error:[/red] Download failed: HTTP {e.response.status_code}")
         raise typer.Exit(1)
     except Exception as e:
         console.print(f"[red]Error:[/red] Download failed: {e}")
@@ -584,7 +970,8 @@ def run_update(
             console.print("\n[yellow]Dry run - no changes made[/yellow]")
             return
 
-        if plan.update_count == 0 and plan.add_count == 0 and plan.merge_count == 0:
+        counts = plan.counts
+        if not (counts[UpdateAction.UPDATE] or counts[UpdateAction.ADD] or counts[UpdateAction.MERGE]):
             console.print("\n[green]✓[/green] No updates needed")
             save_version(project_path, target_version)
             return
@@ -8,14 +8,19 @@ Installed as `sw` command alongside `spectrena`.
 import os
 import re
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import typer
-from git import Repo, InvalidGitRepositoryError, GitCommandError
 from rich.console import Console
 from rich.table import Table
-from rich.tree import Tree
+from rich.text import Text
+
+# GitPython is imported where it's used, so commands that never touch git
+# (sw --help, sw dep ...) don't pay for loading it
+if TYPE_CHECKING:
+    from git import Repo
 
 app = typer.Typer(
     name="sw",
@@ -29,6 +34,11 @@ console = Console()
 # DEPENDENCY MANAGEMENT (Mermaid Format)
 # =============================================================================
 
+# Match: SPEC-ID --> DEP-ID
+_EDGE_RE = re.compile(r'(\S+)\s*-->\s*(\S+)')
+# Match: an indented line holding a single node
+_NODE_RE = re.compile(r'^\s+(\S+)\s*$', re.MULTILINE)
+
 
 def parse_mermaid_deps(path: Path) -> dict[str, list[str]]:
     """
@@ -45,8 +55,7 @@ def parse_mermaid_deps(path: Path) -> dict[str, list[str]]:
         return deps
 
     content = path.read_text()
-    # Match: SPEC-ID --> DEP-ID
-    for match in re.finditer(r'(\S+)\s*-->\s*(\S+)', content):
+    for match in _EDGE_RE.finditer(content):
         spec, dep = match.groups()
         if spec not in deps:
             deps[spec] = []
@@ -54,7 +63,7 @@ def parse_mermaid_deps(path: Path) -> dict[str, list[str]]:
 
     # Also capture standalone nodes (no deps)
     # Match various spec ID formats: CORE-001-slug, CORE-001, 001-slug, etc.
-    for match in re.finditer(r'^\s+(\S+)\s*$', content, re.MULTILINE):
+    for match in _NODE_RE.finditer(content):
         spec = match.group(1)
         # Skip the "graph TD" line and other non-spec lines
         if spec not in ("graph", "TD", "LR") and spec not in deps:
@@ -63,6 +72,67 @@ def parse_mermaid_deps(path: Path) -> dict[str, list[str]]:
     return deps
 
 
+def find_cycles(deps: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Find every dependency cycle in one pass (iterative Tarjan SCC).
+
+    Returns each strongly connected component that is a cycle - more than
+    one spec, or a spec depending on itself - in DFS discovery order.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cycles: list[list[str]] = []
+
+    def visit(node: str) -> None:
+        index[node] = lowlink[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+
+    for root in deps:
+        if root in index:
+            continue
+        visit(root)
+        # Explicit stack of (node, remaining deps) instead of recursion
+        work = [(root, iter(deps.get(root, [])))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    visit(child)
+                    work.append((child, iter(deps.get(child, []))))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in deps.get(node, []):
+                        cycles.append(component[::-1])
+
+    return cycles
+
+
+def _list_spec_dirs(specs_dir: Path) -> set[str]:
+    """Names of the spec directories under specs/ (empty if it's missing)."""
+    try:
+        with os.scandir(specs_dir) as entries:
+            return {entry.name for entry in entries if entry.is_dir()}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def write_mermaid_deps(path: Path, deps: dict[str, list[str]]) -> None:
     """Write deps dict to Mermaid format."""
     lines = ["graph TD"]
@@ -136,11 +206,7 @@ def dep_check():
     warnings = []
 
     # Get actual spec directories
-    actual_specs = (
-        {d.name for d in specs_dir.iterdir() if d.is_dir()}
-        if specs_dir.exists()
-        else set()
-    )
+    actual_specs = _list_spec_dirs(specs_dir)
 
     # Check for missing specs
     all_referenced = set(deps.keys())
@@ -151,24 +217,9 @@ def dep_check():
         if spec not in actual_specs:
             warnings.append(f"Referenced spec not found: {spec}")
 
-    # Check for cycles (simple DFS)
-    def has_cycle(node: str, visited: set[str], path: set[str]) -> bool:
-        if node in path:
-            return True
-        if node in visited:
-            return False
-        visited.add(node)
-        path.add(node)
-        for dep in deps.get(node, []):
-            if has_cycle(dep, visited, path):
-                return True
-        path.remove(node)
-        return False
-
-    visited: set[str] = set()
-    for spec in deps:
-        if has_cycle(spec, visited, set()):
-            errors.append(f"Cycle detected involving: {spec}")
+    # Check for cycles
+    for cycle in find_cycles(deps):
+        errors.append(f"Cycle detected involving: {', '.join(cycle)}")
 
     # Report
     if errors:
@@ -213,9 +264,16 @@ def dep_show(
         if not roots:
             roots = list(deps.keys())[:1]  # Fallback
 
-        def print_tree(spec: str, indent: int = 0, seen: set[str] | None = None):
-            if seen is None:
-                seen = set()
+        # Specs depending on each spec, in deps order
+        dependents: dict[str, list[str]] = {}
+        for s, spec_deps in deps.items():
+            for d in dict.fromkeys(spec_deps):
+                dependents.setdefault(d, []).append(s)
+
+        # `seen` holds the specs on the current path from the root
+        seen: set[str] = set()
+
+        def print_tree(spec: str, indent: int = 0):
             prefix = "  " * indent + ("└─ " if indent > 0 else "")
             status = "[green]✓[/green]" if spec in completed else "[dim]○[/dim]"
             circular = " [yellow](circular)[/yellow]" if spec in seen else ""
@@ -224,10 +282,9 @@ def dep_show(
             if spec in seen:
                 return
             seen.add(spec)
-
-            dependents = [s for s, d in deps.items() if spec in d]
-            for dep in dependents:
-                print_tree(dep, indent + 1, seen.copy())
+            for dep in dependents.get(spec, []):
+                print_tree(dep, indent + 1)
+            seen.remove(spec)
 
         console.print("[bold]Dependency Graph[/bold]\n")
         for root in roots:
@@ -261,10 +318,23 @@ def dep_sync(
 # =============================================================================
 
 
-def get_repo() -> Repo:
-    """Get git repo, searching up from cwd."""
+@lru_cache(maxsize=1)
+def _find_repo(cwd: Path) -> "Repo":
+    from git import Repo
+
+    return Repo(cwd, search_parent_directories=True)
+
+
+def get_repo() -> "Repo":
+    """Get git repo, searching up from cwd.
+
+    The search for .git runs once per working directory; later calls
+    reuse the same Repo.
+    """
+    from git import InvalidGitRepositoryError
+
     try:
-        return Repo(Path.cwd(), search_parent_directories=True)
+        return _find_repo(Path.cwd())
     except InvalidGitRepositoryError:
         console.print("[red]✗ Not in a git repository[/red]")
         raise typer.Exit(1)
@@ -272,11 +342,14 @@ def get_repo() -> Repo:
 
 def get_config() -> dict[str, Any]:
     """Load spectrena config."""
+    from dataclasses import fields
+
     from spectrena.config import Config
 
     try:
         config = Config.load()
-        return config.__dict__ if hasattr(config, "__dict__") else {}
+        # Config is slotted, so there is no __dict__ to hand back
+        return {f.name: getattr(config, f.name) for f in fields(config)}
     except FileNotFoundError:
         return {}
 
@@ -312,12 +385,9 @@ def load_backlog_dependencies() -> tuple[dict[str, list[str]], dict[str, str]]:
     backlog_path = Path.cwd() / config.backlog.path
     entries = parse_backlog(backlog_path)
 
-    dependencies: dict[str, list[str]] = {}
-    status: dict[str, str] = {}
-
-    for spec_id, entry in entries.items():
-        dependencies[spec_id] = entry.depends_on
-        status[spec_id] = entry.status
+    # parse_backlog already lowercases spec-ids and dependency ids
+    dependencies = {spec_id: entry.depends_on for spec_id, entry in entries.items()}
+    status = {spec_id: entry.status for spec_id, entry in entries.items()}
 
     return dependencies, status
 
@@ -347,9 +417,9 @@ def is_spec_ready(
         deps = backlog_deps.get(spec_lower, [])
         unmet = []
 
+        # Backlog dependency ids are stored lowercase already
         for dep in deps:
-            dep_lower = dep.lower()
-            dep_status = backlog_status.get(dep_lower, "❓")
+            dep_status = backlog_status.get(dep, "❓")
 
             # 🟩 = completed, anything else = not ready
             if dep_status != "🟩":
@@ -364,13 +434,28 @@ def is_spec_ready(
     return len(unmet) == 0, unmet
 
 
-def get_spec_branches(repo: Repo) -> list[str]:
+def get_spec_branches(repo: "Repo") -> list[str]:
     """Get all branches matching spec pattern."""
     pattern = "spec/"  # Could be configurable
-    return [b.name for b in repo.branches if b.name.startswith(pattern)]
+    # One for-each-ref call lists just the matching refs, sorted by name
+    output = repo.git.for_each_ref("--format=%(refname)", f"refs/heads/{pattern}")
+    return [ref.removeprefix("refs/heads/") for ref in output.splitlines()]
+
 
+def branch_exists(repo: "Repo", branch: str) -> bool:
+    """Check for a local branch without listing every head."""
+    status, _, _ = repo.git.show_ref(
+        "--verify", "--quiet", f"refs/heads/{branch}",
+        with_extended_output=True, with_exceptions=False,
+    )
+    return status == 0
+
+
+# `git worktree list --porcelain` attribute lines and their dict keys
+_WORKTREE_FIELDS = {"worktree": "path", "HEAD": "head"}
 
-def get_worktrees(repo: Repo) -> list[dict[str, Any]]:
+
+def get_worktrees(repo: "Repo") -> list[dict[str, Any]]:
     """Parse git worktree list output."""
     output = repo.git.worktree("list", "--porcelain")
     worktrees: list[dict[str, Any]] = []
@@ -381,16 +466,15 @@ def get_worktrees(repo: Repo) -> list[dict[str, Any]]:
             if current:
                 worktrees.append(current)
                 current = {}
-        elif line.startswith("worktree "):
-            current["path"] = line[9:]
-        elif line.startswith("HEAD "):
-            current["head"] = line[5:]
-        elif line.startswith("branch "):
-            current["branch"] = line[7:].replace("refs/heads/", "")
-        elif line == "bare":
-            current["bare"] = True
-        elif line == "detached":
-            current["detached"] = True
+            continue
+
+        key, _, value = line.partition(" ")
+        if key == "branch":
+            current["branch"] = value.removeprefix("refs/heads/")
+        elif key in _WORKTREE_FIELDS:
+            current[_WORKTREE_FIELDS[key]] = value
+        elif line in ("bare", "detached"):
+            current[line] = True
 
     if current:
         worktrees.append(current)
@@ -404,7 +488,12 @@ def extract_spec_id(branch: str) -> str:
     return name
 
 
-def get_completed_specs(repo: Repo) -> set[str]:
+def get_worktrees_by_branch(repo: "Repo") -> dict[str, dict[str, Any]]:
+    """Worktrees keyed by checked-out branch (detached and bare ones omitted)."""
+    return {wt["branch"]: wt for wt in get_worktrees(repo) if "branch" in wt}
+
+
+def get_completed_specs(repo: "Repo") -> set[str]:
     """Get spec IDs that have been merged to main.
 
     Checks (in order):
@@ -412,44 +501,49 @@ def get_completed_specs(repo: Repo) -> set[str]:
     2. Remote tracking branch is ancestor of main
     3. Merge commit exists referencing the branch
     """
-    main_branch = "main" if "main" in [b.name for b in repo.branches] else "master"
-    completed = set()
+    from git import GitCommandError
 
-    for branch in repo.branches:
-        if not branch.name.startswith("spec/"):
-            continue
+    main_branch = "main" if branch_exists(repo, "main") else "master"
+    completed = set()
 
-        spec_id = extract_spec_id(branch.name)
+    # Methods 1 and 2 for every branch at once: spec refs, local or on
+    # origin, whose tips main already contains
+    try:
+        output = repo.git.for_each_ref(
+            f"--merged={main_branch}",
+            "--format=%(refname)",
+            "refs/heads/spec/",
+            "refs/remotes/origin/spec/",
+        )
+    except GitCommandError:
+        output = ""
+    merged = {
+        ref.removeprefix("refs/heads/").removeprefix("refs/remotes/origin/")
+        for ref in output.splitlines()
+    }
+
+    merge_log: str | None = None
+    for branch in get_spec_branches(repo):
+        spec_id = extract_spec_id(branch)
 
-        # Method 1: Local branch is ancestor of main
-        try:
-            repo.git.merge_base("--is-ancestor", branch.name, main_branch)
+        if branch in merged:
             completed.add(spec_id)
             continue
-        except GitCommandError:
-            pass
 
-        # Method 2: Remote tracking branch is ancestor of main
-        try:
-            remote_branch = f"origin/{branch.name}"
-            repo.git.merge_base("--is-ancestor", remote_branch, main_branch)
+        # Method 3: Merge commit exists mentioning this branch; main's merge
+        # messages are read once and shared by every remaining branch
+        if merge_log is None:
+            try:
+                # Every spec branch name contains "spec/", so git can
+                # drop unrelated merges before they reach Python
+                merge_log = repo.git.log(
+                    "--merges", "--fixed-strings", "--grep=spec/", "--format=%B",
+                    main_branch,
+                )
+            except GitCommandError:
+                merge_log = ""
+        if branch in merge_log:
             completed.add(spec_id)
-            continue
-        except GitCommandError:
-            pass
-
-        # Method 3: Merge commit exists mentioning this branch
-        try:
-            merge_commits = repo.git.log(
-                "--oneline",
-                f"--grep={branch.name}",
-                main_branch,
-                "--merges"
-            )
-            if merge_commits.strip():
-                completed.add(spec_id)
-        except GitCommandError:
-            pass
 
     return completed
 
@@ -459,12 +553,21 @@ def get_completed_specs(repo: Repo) -> set[str]:
 # =============================================================================
 
 
+# Status cells for `sw list`, styled once rather than parsed from markup per row
+_STATUS_MERGED = Text("✓ merged", style="green")
+_STATUS_DONE = Text("✓ done", style="green")
+_STATUS_IN_PROGRESS = Text("● in progress", style="yellow")
+_STATUS_CANCELLED = Text("✗ cancelled", style="red")
+_STATUS_ACTIVE = Text("● active", style="yellow")
+_STATUS_PENDING = Text("○ pending", style="dim")
+
+
 @app.command("list")
 def list_branches():
     """List all spec branches with status."""
     repo = get_repo()
     branches = get_spec_branches(repo)
-    worktrees = {wt.get("branch"): wt for wt in get_worktrees(repo)}
+    worktrees = get_worktrees_by_branch(repo)
     completed = get_completed_specs(repo)
     _, backlog_status = load_backlog_dependencies()
 
@@ -479,25 +582,27 @@ def list_branches():
     table.add_column("Status", style="green")
     table.add_column("Worktree", style="dim")
 
-    for branch in sorted(branches):
+    # get_spec_branches returns refs already sorted by name
+    for branch in branches:
         spec_id = extract_spec_id(branch)
-        spec_lower = spec_id.lower()
+        backlog = backlog_status.get(spec_id.lower())
+        worktree = worktrees.get(branch)
 
         # Determine status (priority order)
         if spec_id in completed:
-            status = "[green]✓ merged[/green]"
-        elif backlog_status.get(spec_lower) == "🟩":
-            status = "[green]✓ done[/green]"
-        elif backlog_status.get(spec_lower) == "🟨":
-            status = "[yellow]● in progress[/yellow]"
-        elif backlog_status.get(spec_lower) == "🚫":
-            status = "[red]✗ cancelled[/red]"
-        elif branch in worktrees:
-            status = "[yellow]● active[/yellow]"
+            status = _STATUS_MERGED
+        elif backlog == "🟩":
+            status = _STATUS_DONE
+        elif backlog == "🟨":
+            status = _STATUS_IN_PROGRESS
+        elif backlog == "🚫":
+            status = _STATUS_CANCELLED
+        elif worktree is not None:
+            status = _STATUS_ACTIVE
         else:
-            status = "[dim]○ pending[/dim]"
+            status = _STATUS_PENDING
 
-        wt_path = worktrees.get(branch, {}).get("path", "")
+        wt_path = worktree.get("path", "") if worktree is not None else ""
         table.add_row(branch, spec_id, status, wt_path)
 
     console.print(table)
@@ -554,36 +659,41 @@ def ready():
         elif unmet:
             blocked_specs.append((branch, spec_id, unmet))
 
-    # Display results
+    # Display results, collected and printed in one call
+    lines: list[str] = []
     if ready_specs:
-        console.print("[bold green]Ready to work on:[/bold green]\n")
+        lines.append("[bold green]Ready to work on:[/bold green]\n")
         for branch, spec_id in ready_specs:
-            console.print(f"  [cyan]{branch}[/cyan]")
-            console.print(f"    sw create {branch}")
-            console.print()
+            lines.append(f"  [cyan]{branch}[/cyan]")
+            lines.append(f"    sw create {branch}")
+            lines.append("")
     else:
-        console.print("[yellow]No specs ready to work on[/yellow]")
+        lines.append("[yellow]No specs ready to work on[/yellow]")
 
     # Show blocked specs with reasons
     if blocked_specs:
-        console.print("\n[bold yellow]Blocked specs:[/bold yellow]\n")
+        lines.append("\n[bold yellow]Blocked specs:[/bold yellow]\n")
         for branch, spec_id, unmet in blocked_specs:
-            console.print(f"  [dim]{spec_id}[/dim]")
-            console.print(f"    Waiting on: {', '.join(unmet)}")
-            console.print()
+            lines.append(f"  [dim]{spec_id}[/dim]")
+            lines.append(f"    Waiting on: {', '.join(unmet)}")
+            lines.append("")
 
     # Show data source being used
     if backlog_status:
-        console.print(f"\n[dim]Using backlog dependencies ({len(backlog_status)} specs tracked)[/dim]")
+        lines.append(f"\n[dim]Using backlog dependencies ({len(backlog_status)} specs tracked)[/dim]")
     elif mermaid_deps:
-        console.print(f"\n[dim]Using deps.mermaid ({len(mermaid_deps)} specs)[/dim]")
+        lines.append(f"\n[dim]Using deps.mermaid ({len(mermaid_deps)} specs)[/dim]")
     else:
-        console.print("\n[dim]No dependency data found (all specs shown as ready)[/dim]")
+        lines.append("\n[dim]No dependency data found (all specs shown as ready)[/dim]")
+
+    console.print("\n".join(lines))
 
 
 @app.command()
 def create(branch: str, path: str | None = typer.Argument(None)):
     """Create a worktree for a spec branch."""
+    from git import GitCommandError
+
     repo = get_repo()
 
     # Normalize branch name
@@ -597,10 +707,8 @@ def create(branch: str, path: str | None = typer.Argument(None)):
         path = str(worktree_dir / branch.replace("spec/", ""))
 
     # Check if branch exists
-    branch_exists = branch in [b.name for b in repo.branches]
-
     try:
-        if branch_exists:
+        if branch_exists(repo, branch):
             repo.git.worktree("add", path, branch)
             console.print(f"[green]✓ Created worktree at {path}[/green]")
         else:
@@ -620,7 +728,7 @@ def create(branch: str, path: str | None = typer.Argument(None)):
 def open_worktree(branch: str):
     """Open a worktree in a new terminal."""
     repo = get_repo()
-    worktrees = {wt.get("branch"): wt for wt in get_worktrees(repo)}
+    worktrees = get_worktrees_by_branch(repo)
 
     # Normalize branch name
     if not branch.startswith("spec/"):
@@ -653,15 +761,17 @@ def merge(
     branch: str, delete: bool = typer.Option(True, help="Delete branch after merge")
 ):
     """Merge a completed spec branch and cleanup worktree."""
+    from git import GitCommandError
+
     repo = get_repo()
-    worktrees = {wt.get("branch"): wt for wt in get_worktrees(repo)}
+    worktrees = get_worktrees_by_branch(repo)
 
     # Normalize branch name
     if not branch.startswith("spec/"):
         branch = f"spec/{branch}"
 
     # Get main branch
-    main_branch = "main" if "main" in [b.name for b in repo.branches] else "master"
+    main_branch = "main" if branch_exists(repo, "main") else "master"
 
     # Check we're not in the worktree we're trying to remove
     if branch in worktrees:
@@ -0,0 +1,220 @@
+"""
+Tests for spectrena.backlog module.
+"""
+
+import pytest
+import os
+from spectrena.backlog import (
+    parse_backlog,
+    update_backlog_status,
+    update_backlog_statuses,
+    get_dependency_status,
+    _build_prefix_index,
+)
+
+
+SAMPLE_BACKLOG = """# Spec Backlog
+
+## Phase 1: Foundation
+
+### core-001-project-setup
+
+**Scope:** Project structure, build system, tooling configuration
+
+| Attribute | Value |
+|-----------|-------|
+| **Weight** | STANDARD |
+| **Status** | 🟩 |
+| **Depends On** | (none) |
+| **References** | ARCH §Project Structure |
+
+**Covers:**
+- Repository structure
+- Build tooling setup
+
+**Does NOT cover:**
+- Application implementation
+
+---
+
+### core-002-database-schema
+
+**Scope:** Database schema and migrations setup
+
+| Attribute | Value |
+|-----------|-------|
+| **Weight** | FORMAL |
+| **Status** | ⬜ |
+| **Depends On** | core-001 |
+| **References** | ARCH §Database, DOM |
+
+**Covers:**
+- Schema definition
+- Migration tooling
+
+---
+
+### core-003-authentication
+
+**Scope:** User authentication system
+
+| Attribute | Value |
+|-----------|-------|
+| **Weight** | LIGHTWEIGHT |
+| **Status** | 🟨 |
+| **Depends On** | core-001, core-002-database-schema, core-999 |
+| **References** | REQ §Auth |
+"""
+
+
+@pytest.fixture
+def backlog_file(temp_dir):
+    """Write the sample backlog to disk."""
+    path = temp_dir / "backlog.md"
+    path.write_text(SAMPLE_BACKLOG)
+    return path
+
+
+class TestParseBacklog:
+    """Test parse_backlog function."""
+
+    def test_parse_nonexistent(self, temp_dir):
+        """Test parsing when backlog doesn't exist."""
+        assert parse_backlog(temp_dir / "missing.md") == {}
+
+    def test_parse_entries(self, backlog_file):
+        """Test all entries are found and keyed by spec-id."""
+        entries = parse_backlog(backlog_file)
+        assert list(entries) == [
+            "core-001-project-setup",
+            "core-002-database-schema",
+            "core-003-authentication",
+        ]
+
+    def test_parse_attributes(self, backlog_file):
+        """Test table attributes and scope are extracted."""
+        entry = parse_backlog(backlog_file)["core-002-database-schema"]
+        assert entry.scope == "Database schema and migrations setup"
+        assert entry.weight == "FORMAL"
+        assert entry.status == "⬜"
+        assert entry.depends_on == ["core-001"]
+        assert entry.references == ["ARCH §Database", "DOM"]
+
+    def test_parse_no_dependencies(self, backlog_file):
+        """Test (none) dependencies parse to an empty list."""
+        entry = parse_backlog(backlog_file)["core-001-project-setup"]
+        assert entry.depends_on == []
+
+    def test_parse_bullet_lists(self, backlog_file):
+        """Test Covers / Does NOT cover bullet lists."""
+        entry = parse_backlog(backlog_file)["core-001-project-setup"]
+        assert entry.covers == ["Repository structure", "Build tooling setup"]
+        assert entry.does_not_cover == ["Application implementation"]
+
+        entry = parse_backlog(backlog_file)["core-003-authentication"]
+        assert entry.covers == []
+        assert entry.does_not_cover == []
+
+    def test_parse_empty_fields(self, temp_dir):
+        """Test empty fields don't pick up the following line."""
+        path = temp_dir / "backlog.md"
+        path.write_text(
+            SAMPLE_BACKLOG.replace(
+                "**Scope:** Project structure, build system, tooling configuration",
+                "**Scope:**",
+            ).replace("| **Weight** | FORMAL |", "| **Weight** |  |")
+        )
+
+        entries = parse_backlog(path)
+        assert entries["core-001-project-setup"].scope == ""
+        assert entries["core-002-database-schema"].weight == "STANDARD"
+        assert entries["core-002-database-schema"].status == "⬜"
+
+    def test_parse_fields_sharing_a_row(self, temp_dir):
+        """Test two field cells on one table row are both read."""
+        path = temp_dir / "backlog.md"
+        path.write_text(
+            SAMPLE_BACKLOG.replace(
+                "| **Weight** | LIGHTWEIGHT |\n| **Status** | 🟨 |",
+                "| **Weight** | LIGHTWEIGHT | **Status** | 🟩 |",
+            )
+        )
+
+        entry = parse_backlog(path)["core-003-authentication"]
+        assert entry.weight == "LIGHTWEIGHT"
+        assert entry.status == "🟩"
+
+    def test_dependencies_lowercased(self, temp_dir):
+        """Test dependency ids are normalized to lowercase."""
+        path = temp_dir / "backlog.md"
+        path.write_text(SAMPLE_BACKLOG.replace("| core-001 |", "| CORE-001 |"))
+
+        entries = parse_backlog(path)
+        assert entries["core-002-database-schema"].depends_on == ["core-001"]
+
+
+class TestUpdateBacklogStatus:
+    """Test update_backlog_status function."""
+
+    def test_update_status(self, backlog_file):
+        """Test only the targeted spec's status changes."""
+        update_backlog_status(backlog_file, "core-002-database-schema", "🟨")
+
+        entries = parse_backlog(backlog_file)
+        assert entries["core-002-database-schema"].status == "🟨"
+        assert entries["core-001-project-setup"].status == "🟩"
+        assert entries["core-003-authentication"].status == "🟨"
+
+    def test_update_statuses_batch(self, backlog_file):
+        """Test several statuses update in one call, by id or prefix."""
+        update_backlog_statuses(
+            backlog_file, {"CORE-001": "🚫", "core-003-authentication": "🟩"}
+        )
+
+        entries = parse_backlog(backlog_file)
+        assert entries["core-001-project-setup"].status == "🚫"
+        assert entries["core-002-database-schema"].status == "⬜"
+        assert entries["core-003-authentication"].status == "🟩"
+
+    def test_update_noop_skips_write(self, backlog_file):
+        """Test unchanged or unknown statuses leave the file untouched."""
+        os.utime(backlog_file, ns=(0, 0))
+        update_backlog_statuses(backlog_file, {"core-001": "🟩", "nope": "🟨"})
+        assert backlog_file.stat().st_mtime_ns == 0
+
+
+class TestDependencyStatus:
+    """Test get_dependency_status function."""
+
+    def test_dependency_status(self, backlog_file):
+        """Test exact, prefix and unknown dependency resolution."""
+        entries = parse_backlog(backlog_file)
+        status = get_dependency_status(entries, "core-003-authentication")
+        assert status == {
+            "core-001": "🟩",
+            "core-002-database-schema": "⬜",
+            "core-999": "❓",
+        }
+
+    def test_prefix_on_segment_boundary(self, backlog_file):
+        """Test shared prefixes resolve to the first spec in backlog order."""
+        entries = parse_backlog(backlog_file)
+        index = _build_prefix_index(entries)
+        assert index["core"].spec_id == "core-001-project-setup"
+        assert index["core-002"].spec_id == "core-002-database-schema"
+        assert "core-00" not in index
+
+    def test_prefix_off_segment_boundary(self, temp_dir):
+        """Test prefixes not ending on a dash still resolve, in backlog order."""
+        path = temp_dir / "backlog.md"
+        path.write_text(SAMPLE_BACKLOG.replace("| core-001 |", "| CORE-00 |"))
+
+        entries = parse_backlog(path)
+        status = get_dependency_status(entries, "core-002-database-schema")
+        # Keys are reported lowercase, as parse_backlog stores them
+        assert status == {"core-00": "🟩"}
+
+    def test_unknown_spec(self, backlog_file):
+        """Test unknown spec has no dependency status."""
+        entries = parse_backlog(backlog_file)
+        assert get_dependency_status(entries, "nope") == {}
@@ -4,7 +4,7 @@ Tests for spectrena.config module.
 
 import pytest
 from pathlib import Path
-from spectrena.config import Config, SpecIdConfig
+from spectrena.config import Config, SpecIdConfig, _split_posix_key
 
 
 class TestSpecIdConfig:
@@ -78,6 +78,24 @@ class TestSpecIdConfig:
         config = SpecIdConfig(components=[])
         assert config.validate_component("ANYTHING") is True
 
+        # Reassigning components refreshes the lookup
+        config.components = ["web"]
+        assert config.validate_component("WEB") is True
+        assert config.validate_component("CORE") is False
+
+        # So does mutating the list in place
+        config.components.append("Api")
+        assert config.validate_component("API") is True
+
+    def test_branch_pattern_re(self):
+        """Test compiled branch pattern follows field changes."""
+        config = SpecIdConfig(template="{project}-{component}-{NNN}-{slug}")
+        assert config.branch_pattern_re.match("APP-CORE-001-user-auth")
+
+        config.project = "MY.APP"
+        assert config.branch_pattern_re.match("MY.APP-CORE-001-x")
+        assert not config.branch_pattern_re.match("MYXAPP-CORE-001-x")
+
 
 class TestConfig:
     """Test Config class."""
@@ -105,6 +123,89 @@ class TestConfig:
         assert "API" in loaded.spec_id.components
         assert loaded.spec_id.project == "MYAPP"
 
+    def test_save_and_load_sections(self, temp_dir):
+        """Test backlog reference docs and git settings round-trip."""
+        config = Config()
+        config.backlog.enabled = True
+        config.backlog.reference_docs = {"ARCH": "docs/arch.md", "REQ": "docs/req.md"}
+        config.git.provider = "gitlab"
+        config.git.auto_delete_branch = True
+
+        config.save(temp_dir)
+
+        loaded = Config.load(temp_dir)
+        assert loaded.backlog.enabled is True
+        assert loaded.backlog.reference_docs == {
+            "ARCH": "docs/arch.md",
+            "REQ": "docs/req.md",
+        }
+        assert loaded.git.provider == "gitlab"
+        assert loaded.git.auto_delete_branch is True
+
+    def test_load_cached_returns_fresh_copy(self, temp_dir):
+        """Test repeat loads don't share mutable state and see saves."""
+        config = Config()
+        config.spec_id.components = ["CORE"]
+        config.save(temp_dir)
+
+        first = Config.load(temp_dir)
+        first.spec_id.components.append("API")
+        assert Config.load(temp_dir).spec_id.components == ["CORE"]
+
+        config.spec_id.components = ["WEB"]
+        config.save(temp_dir)
+        assert Config.load(temp_dir).spec_id.components == ["WEB"]
+
+    def test_load_crlf(self, temp_dir):
+        """Test configs saved with Windows line endings."""
+        config = Config()
+        config.spec_id.components = ["CORE", "API"]
+        config.save(temp_dir)
+        path = temp_dir / ".spectrena" / "config.yml"
+        path.write_bytes(path.read_bytes().replace(b"\n", b"\r\n"))
+
+        loaded = Config.load(temp_dir)
+        assert loaded.spec_id.template == "{NNN}-{slug}"
+        assert loaded.spec_id.components == ["CORE", "API"]
+
+    def test_load_empty_upper_key_in_list(self, temp_dir):
+        """Test an empty UPPER_KEY: line doesn't capture the rest of a list."""
+        config_dir = temp_dir / ".spectrena"
+        config_dir.mkdir()
+        (config_dir / "config.yml").write_text(
+            "spec_id:\n"
+            "  components:\n"
+            "    - CORE\n"
+            "    ARCH:\n"
+            "    - API\n"
+            "  padding: 4\n"
+        )
+
+        loaded = Config.load(temp_dir)
+        assert loaded.spec_id.components == ["CORE", "API"]
+        assert loaded.spec_id.padding == 4
+
+    def test_load_yaml_booleans(self, temp_dir):
+        """Test YAML 1.1 true spellings enable sections."""
+        config_dir = temp_dir / ".spectrena"
+        config_dir.mkdir()
+        (config_dir / "config.yml").write_text(
+            "backlog:\n  enabled: yes\n\ngit:\n  auto_delete_branch: False\n"
+        )
+
+        loaded = Config.load(temp_dir)
+        assert loaded.backlog.enabled is True
+        assert loaded.git.auto_delete_branch is False
+
+    @pytest.mark.parametrize("value", ["1", "y", "Y", "on", "TRUE"])
+    def test_load_true_spellings(self, temp_dir, value):
+        """Test each accepted true spelling enables a section."""
+        config_dir = temp_dir / ".spectrena"
+        config_dir.mkdir()
+        (config_dir / "config.yml").write_text(f"backlog:\n  enabled: {value}\n")
+
+        assert Config.load(temp_dir).backlog.enabled is True
+
     def test_load_nonexistent(self, temp_dir):
         """Test loading when config doesn't exist."""
         config = Config.load(temp_dir)
@@ -127,3 +228,26 @@ class TestConfig:
         assert "- API" in yaml
         assert "project: \"TEST\"" in yaml
         assert "enabled: true" in yaml
+
+
+class TestMenuKeys:
+    """Test splitting terminal reads into menu keys."""
+
+    def _keys(self, buffer):
+        keys = []
+        while buffer:
+            key, buffer = _split_posix_key(buffer)
+            keys.append(key)
+        return keys
+
+    def test_buffered_keys_split(self):
+        """Test several keys returned by one read are kept apart."""
+        assert self._keys(b"\x1b[A\x1b[A\x1bOB\r") == [
+            b"\x1b[A", b"\x1b[A", b"\x1bOB", b"\r",
+        ]
+        assert self._keys(b"\x1b[1;5Aq") == [b"\x1b[1;5A", b"q"]
+
+    def test_escape_and_text(self):
+        """Test a lone escape and multi-byte text split per character."""
+        assert self._keys(b"\x1b") == [b"\x1b"]
+        assert self._keys("ab✓".encode()) == [b"a", b"b", "✓".encode()]
@@ -9,6 +9,7 @@ from spectrena.worktrees import (
     parse_mermaid_deps,
     write_mermaid_deps,
     load_dependencies,
+    find_cycles,
 )
 
 
@@ -284,6 +285,26 @@ class TestDependencyValidation:
         result = dep_check()
         assert result == False  # Cycle detected
 
+    def test_find_cycles_reports_each_cycle(self):
+        """Test every cycle is found once, including self-loops."""
+        deps = {
+            "A": ["B"],
+            "B": ["C"],
+            "C": ["A"],
+            "D": ["D"],
+            "E": ["A"],
+            "F": ["G"],
+            "G": ["F", "A"],
+        }
+        assert find_cycles(deps) == [["A", "B", "C"], ["D"], ["F", "G"]]
+        assert find_cycles({"X": ["Y"], "Y": []}) == []
+
+    def test_find_cycles_deep_chain(self):
+        """Test long chains don't hit the recursion limit."""
+        deps = {f"S{i}": [f"S{i + 1}"] for i in range(5000)}
+        deps["S5000"] = ["S0"]
+        assert [len(c) for c in find_cycles(deps)] == [5001]
+
     def test_no_cycle_valid_graph(self, temp_dir):
         """Test validation passes for valid graph."""
         from spectrena.worktrees import dep_check
@@ -393,6 +393,8 @@ class TestOtherMCPTools:
             "velocity",
             "dep_graph_analyze",
             "dep_graph_save",
+            "cache_stats",
+            "cache_clear",
         ]
 
         for tool_name in expected_tools:
@@ -0,0 +1,53 @@
+"""
+Tests for spectrena.lineage.migrations module.
+"""
+
+import asyncio
+
+import pytest
+
+from spectrena.lineage.migrations import (
+    CURRENT_SCHEMA_VERSION,
+    MigrationError,
+    ensure_schema,
+)
+
+
+class FakeDB:
+    """Stand-in connection returning canned per-statement results."""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.scripts = []
+
+    async def query(self, sql, bindings=None):
+        return []  # No schema_meta yet: version 0
+
+    async def query_raw(self, sql, bindings=None):
+        self.scripts.append(sql)
+        count = sql.count(";") - 2  # Minus BEGIN / COMMIT
+        results = [{"status": "OK", "result": []} for _ in range(count)]
+        if self.fail_at is not None:
+            rolled_back = "The query was not executed due to a failed transaction"
+            results = [{"status": "ERR", "result": rolled_back} for _ in range(count)]
+            results[self.fail_at] = {"status": "ERR", "result": "Field already exists"}
+        return {"result": results}
+
+
+class TestEnsureSchema:
+    """Test ensure_schema function."""
+
+    def test_applies_each_migration_once(self):
+        """Test every SQL migration is sent as a single transaction."""
+        db = FakeDB()
+        asyncio.run(ensure_schema(db))
+        assert len(db.scripts) == CURRENT_SCHEMA_VERSION
+        assert all(s.startswith("BEGIN TRANSACTION;") for s in db.scripts)
+
+    def test_failing_statement_reported_without_replay(self):
+        """Test the failing statement is named and nothing is re-run."""
+        db = FakeDB(fail_at=1)
+        with pytest.raises(MigrationError, match="Field already exists") as exc:
+            asyncio.run(ensure_schema(db))
+        assert "DEFINE FIELD version ON schema_meta" in str(exc.value)
+        assert len(db.scripts) == 1
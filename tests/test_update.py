@@ -0,0 +1,40 @@
+"""
+Tests for spectrena.update module.
+"""
+
+import importlib
+
+# spectrena.update is shadowed on the package by the `update` command
+update = importlib.import_module("spectrena.update")
+
+
+def _snapshot(root):
+    """Map every file under root to its (content, mtime_ns)."""
+    return {
+        path.relative_to(root): (path.read_bytes(), path.stat().st_mtime_ns)
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+class TestCreateUpdatePlan:
+    """Test create_update_plan function."""
+
+    def test_plan_leaves_project_unchanged(self, temp_dir):
+        """Test building a plan (as --dry-run does) writes nothing."""
+        template = temp_dir / "template"
+        project = temp_dir / "project"
+        for root, text in ((template, "new\n"), (project, "old\n")):
+            (root / ".spectrena" / "scripts").mkdir(parents=True)
+            (root / ".spectrena" / "scripts" / "common.sh").write_text(text)
+            (root / ".spectrena" / "memory").mkdir()
+            (root / ".spectrena" / "memory" / "constitution.md").write_text(text)
+        (template / ".claude" / "commands").mkdir(parents=True)
+        (template / ".claude" / "commands" / "spectrena.specify.md").write_text("new\n")
+
+        before = _snapshot(project)
+        plan = update.create_update_plan(project, template, "1.0.0", "1.1.0")
+        update.display_update_plan(plan)
+
+        assert plan.files
+        assert _snapshot(project) == before
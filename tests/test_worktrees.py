@@ -71,6 +71,19 @@ class TestWorktreesHelpers:
         assert "CORE-002" in deps["API-001"]
         assert deps["UI-001"] == ["API-001"]
 
+    def test_list_spec_dirs_follows_symlinks(self, temp_dir):
+        """Test symlinked spec directories are listed like real ones."""
+        from spectrena.worktrees import _list_spec_dirs
+
+        specs_dir = temp_dir / "specs"
+        (specs_dir / "001-real").mkdir(parents=True)
+        (temp_dir / "elsewhere").mkdir()
+        (specs_dir / "002-linked").symlink_to(temp_dir / "elsewhere")
+        (specs_dir / "notes.md").write_text("not a spec\n")
+
+        assert _list_spec_dirs(specs_dir) == {"001-real", "002-linked"}
+        assert _list_spec_dirs(temp_dir / "missing") == set()
+
     @pytest.mark.skip(reason="Git signing issues in test environment")
     def test_get_completed_specs(self, git_repo, temp_dir):
         """Test getting completed (merged) specs."""